@@ -3,10 +3,22 @@
 # Date: 23/10 - 18
 # ============================
 
+from NEATWrapper.activations import *
+from NEATWrapper.cache import *
+from NEATWrapper.checkpoint import *
 from NEATWrapper.connection import *
+from NEATWrapper.export import *
 from NEATWrapper.genome import *
 from NEATWrapper.innovation import *
+from NEATWrapper.islands import *
+from NEATWrapper.metrics import *
 from NEATWrapper.node import Node
+from NEATWrapper.packed import *
+from NEATWrapper.phenotype import *
 from NEATWrapper.population import *
+from NEATWrapper.profiling import *
+from NEATWrapper.racing import *
+from NEATWrapper.scheduler import *
 from NEATWrapper.simulation import *
+from NEATWrapper.speciation import *
 from NEATWrapper.species import *
\ No newline at end of file
@@ -0,0 +1,78 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+"""
+Registry of the activation functions a node can have.
+
+Every function works on NumPy arrays, so Phenotype applies it to all the values of a layer that share it in one array operation. Node.forward works on one Python float at a time, where a NumPy call costs more than the work itself, so it uses the plain Python version of the function in SCALAR_ACTIVATIONS. Packed genomes store the activation of a node as its index in ACTIVATION_NAMES, so register custom functions in the same order in every process.
+"""
+
+# Built-in libraries
+import math
+
+# Third-party libraries
+import numpy as np
+
+def identity(x):
+    return x
+
+def relu(x):
+    return np.maximum(x, 0)
+
+def sigmoid(x):
+    # * Written with tanh, which does not overflow for large negative x like exp(-x) does.
+    return 0.5 * (1 + np.tanh(0.5 * x))
+
+def tanh(x):
+    return np.tanh(x)
+
+ACTIVATIONS = {
+    'identity': identity,
+    'relu': relu,
+    'sigmoid': sigmoid,
+    'tanh': tanh
+}
+
+def scalarRelu(x):
+    return max(x, 0.0)
+
+def scalarSigmoid(x):
+    return 0.5 * (1 + math.tanh(0.5 * x))
+
+SCALAR_ACTIVATIONS = {
+    'identity': identity,
+    'relu': scalarRelu,
+    'sigmoid': scalarSigmoid,
+    'tanh': math.tanh
+}
+
+ACTIVATION_NAMES = ['identity', 'relu', 'sigmoid', 'tanh']
+
+def registerActivation(name, fn, scalar=None):
+    """registerActivation - Adds an activation function to the registry.
+
+    Args:
+        name (String): Name of the function.
+        fn (function): The function. It must accept NumPy arrays.
+        scalar (function, optional): Defaults to fn. Version of the function for a single Python float.
+    """
+
+    if name not in ACTIVATIONS:
+        ACTIVATION_NAMES.append(name)
+    ACTIVATIONS[name] = fn
+    SCALAR_ACTIVATIONS[name] = scalar or fn
+
+def defaultActivation(nodeType):
+    """defaultActivation - The activation a new node of the given type gets.
+
+    Args:
+        nodeType (String): 'input', 'output' or 'hidden'.
+
+    Returns:
+        String: 'identity' for input nodes, so observations pass through unchanged, and 'relu' otherwise.
+    """
+
+    return 'identity' if nodeType == 'input' else 'relu'
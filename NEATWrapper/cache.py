@@ -0,0 +1,88 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# Built-in libraries
+from collections import OrderedDict
+
+class FitnessCache:
+    """FitnessCache - Least recently used cache of rewards, keyed by phenotype.
+
+    Every generation the champion of each species is copied unchanged into the next one, and in deterministic environments it would get the same reward again. Simulation keys this cache by (Phenotype.hash(), environment seed) and only evaluates the genes it misses. Once the cache is full, the least recently used entry is evicted.
+
+    Args:
+        maxSize (Int, optional): Defaults to 10000. Maximum number of entries.
+    """
+
+    def __init__(self, maxSize=10000):
+        self.maxSize = maxSize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """get - Looks up the reward stored for a key, and marks it as recently used.
+
+        Args:
+            key (Hashable): The key.
+
+        Returns:
+            Float: The reward, or None if the key is not in the cache.
+        """
+
+        reward = self.entries.get(key)
+        if reward is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return reward
+
+    def put(self, key, reward):
+        """put - Stores the reward for a key, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key (Hashable): The key.
+            reward (Float): The reward.
+        """
+
+        self.entries[key] = reward
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxSize:
+            self.entries.popitem(last=False)
+
+    def hitRate(self):
+        """hitRate - Fraction of the lookups that were hits.
+
+        Returns:
+            Float: The hit rate, 0 if there were no lookups.
+        """
+
+        lookups = self.hits + self.misses
+
+        return self.hits / lookups if lookups else 0
+
+    def stats(self):
+        return {
+            'size': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hitRate': self.hitRate()
+        }
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return "FitnessCache: \n===> Entries - {}, \n===> Hit rate - {:.3f}".format(
+            len(self.entries),
+            self.hitRate()
+        )
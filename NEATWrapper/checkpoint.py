@@ -0,0 +1,148 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# Built-in libraries
+import json
+import os
+import random
+import shutil
+from math import inf
+
+# Third-party libraries
+import numpy as np
+
+# Custom libraries
+from NEATWrapper.packed import concatenatePacked, splitPacked
+from NEATWrapper.population import Population
+from NEATWrapper.species import Species
+
+# * Version 2 added the node activations. Version 1 genomes applied relu per connection, so they are not loaded as version 2 ones.
+VERSION = 2
+
+def saveCheckpoint(population, path, **extra):
+    """saveCheckpoint - Saves the full state of a population to a checkpoint directory.
+
+    The genomes of the population, the species champions and the best gene are stored as flat arrays (see concatenatePacked), together with the species statistics, the innovation history, the state of the random module and the settings the population was created with. Every array is written as its own .npy file next to a small meta.json, so loading can memory map them. The checkpoint is written to a temporary directory first and then moved in place, so a crash while saving leaves the previous checkpoint intact.
+
+    Args:
+        population (Population): The population to save.
+        path (String): Directory to write the checkpoint to.
+        **extra: JSON serializable values stored alongside, e.g. the current generation.
+    """
+
+    champs = [s.champ for s in population.species]
+    best = [population.bestGene] if population.bestGene is not None else []
+    innovations = population.innovationHistory.connectionsDone
+    version, state, gauss = random.getstate()
+
+    arrays = {}
+    for prefix, genes in (('population', population.population), ('champs', champs), ('best', best)):
+        for name, array in concatenatePacked(genes).items():
+            arrays[prefix + '.' + name] = array
+
+    arrays['species.bestFitness'] = np.array([s.bestFitness for s in population.species], dtype=float)
+    arrays['species.bestSteps'] = np.array([s.bestSteps for s in population.species], dtype=float)
+    arrays['species.staleness'] = np.array([s.staleness for s in population.species], dtype=np.int64)
+    arrays['species.avgFitness'] = np.array([s.avgFitness for s in population.species], dtype=float)
+    arrays['species.topoCoeff'] = np.array([s.topoCoeff for s in population.species], dtype=float)
+    arrays['species.weightCoeff'] = np.array([s.weightCoeff for s in population.species], dtype=float)
+    arrays['species.compatibilityThreshold'] = np.array([s.compatibilityThreshold for s in population.species], dtype=float)
+    arrays['innovation.pairs'] = np.array(list(innovations.keys()), dtype=np.int64).reshape(-1, 2)
+    arrays['innovation.numbers'] = np.array(list(innovations.values()), dtype=np.int64)
+    arrays['innovation.lastSeen'] = np.array([population.innovationHistory.lastSeen.get(key, -1) for key in innovations], dtype=np.int64)
+    arrays['random.state'] = np.array(state, dtype=np.uint64)
+
+    meta = {
+        'version': VERSION,
+        'popSize': population.pop_size,
+        'workers': population.workers,
+        'profile': population.profiler.enabled,
+        'packed': population.packed,
+        'bestScore': population.bestScore if population.bestScore != -inf else None,
+        'innoNo': population.innovationHistory.innoNo,
+        'pruneAfter': population.innovationHistory.pruneAfter,
+        'innovationGeneration': population.innovationHistory.generation,
+        'randomVersion': version,
+        'randomGauss': gauss,
+        'arrays': sorted(arrays),
+        'extra': extra
+    }
+
+    tmp = path.rstrip(os.sep) + '.tmp'
+    old = path.rstrip(os.sep) + '.old'
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp, name + '.npy'), array)
+    with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+
+    shutil.rmtree(old, ignore_errors=True)
+    if os.path.exists(path):
+        os.rename(path, old)
+    os.rename(tmp, path)
+    shutil.rmtree(old, ignore_errors=True)
+
+def loadCheckpoint(path, restoreRandom=True):
+    """loadCheckpoint - Loads a population saved with saveCheckpoint.
+
+    The arrays are memory mapped and the genomes are unpacked straight from them, or, for a population with packed=True, kept as PackedGenome views of them.
+
+    Args:
+        path (String): Directory the checkpoint was written to.
+        restoreRandom (bool, optional): Defaults to True. Whether or not to restore the state of the random module, so the run continues exactly as it would have.
+
+    Returns:
+        Tuple: The restored Population and the dict of extra values given to saveCheckpoint.
+    """
+
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+
+    if meta['version'] != VERSION:
+        raise ValueError('Unsupported checkpoint version: {}'.format(meta['version']))
+
+    arrays = {name: np.load(os.path.join(path, name + '.npy'), mmap_mode='r') for name in meta['arrays']}
+
+    def genes(prefix):
+        group = {name[len(prefix)+1:]: array for name, array in arrays.items() if name.startswith(prefix + '.')}
+        return [population.fromPacked(gene) for gene in splitPacked(group)]
+
+    # * workers decides how the offspring are bred, so it is restored for the run to continue as it would have.
+    population = Population(0, 0, 0, profile=meta.get('profile', False), workers=meta.get('workers'), packed=meta.get('packed', False))
+    population.pop_size = meta['popSize']
+    population.population = genes('population')
+    population.bestScore = meta['bestScore'] if meta['bestScore'] is not None else -inf
+
+    best = genes('best')
+    population.bestGene = best[0] if best else None
+
+    for i, champ in enumerate(genes('champs')):
+        s = Species(champ)
+        s.members = []
+        s.bestFitness = arrays['species.bestFitness'][i].item()
+        s.bestSteps = arrays['species.bestSteps'][i].item()
+        s.staleness = int(arrays['species.staleness'][i])
+        s.avgFitness = arrays['species.avgFitness'][i].item()
+        s.topoCoeff = arrays['species.topoCoeff'][i].item()
+        s.weightCoeff = arrays['species.weightCoeff'][i].item()
+        s.compatibilityThreshold = arrays['species.compatibilityThreshold'][i].item()
+        population.species.append(s)
+
+    pairs = arrays['innovation.pairs'].tolist()
+    numbers = arrays['innovation.numbers'].tolist()
+    population.innovationHistory.connectionsDone = {(inId, outId): inno for (inId, outId), inno in zip(pairs, numbers)}
+    population.innovationHistory.innoNo = meta['innoNo']
+    population.innovationHistory.pruneAfter = meta['pruneAfter']
+    population.innovationHistory.generation = meta['innovationGeneration']
+    lastSeen = arrays['innovation.lastSeen'].tolist()
+    population.innovationHistory.lastSeen = {(inId, outId): seen for (inId, outId), seen in zip(pairs, lastSeen) if seen >= 0}
+
+    if restoreRandom:
+        state = tuple(int(x) for x in arrays['random.state'])
+        random.setstate((meta['randomVersion'], state, meta['randomGauss']))
+
+    return population, meta['extra']
@@ -6,8 +6,6 @@
 
 # Built-in Libraries
 from random import random, uniform
-from math import e
-from copy import copy
 
 class Connection:
     """Connection - This is a Connection object, to store informatioon about a connection between two nodes. 
@@ -20,6 +18,8 @@ class Connection:
             weight (Float): Float value of the weight assigned to this connection.
             innovation (int, optional): Defaults to 0. Innovation number of this type of connection.
         """
+    __slots__ = ('inNode', 'outNode', 'weight', 'enabled', 'innovation')
+
     def __init__(self, _in, _out, weight, innovation=0):
         self.inNode = _in
         self.outNode = _out
@@ -30,18 +30,7 @@ class Connection:
     def forward(self):
         if not self.enabled:
             return
-        _input = self.inNode.value
-        output = _input * self.weight
-        output = self.relu(output)
-        self.outNode.value += output
-
-    def sigmoid(self, x):
-        y = 1 / (1 + e**(-x))
-        return y
-
-    def relu(self, x):
-        y = max(x, 0)
-        return y
+        self.outNode.value += self.inNode.value * self.weight
 
     def setInnovationNo(self, number):
         self.innovation = number
@@ -56,12 +45,15 @@ class Connection:
         else:
             self.weight = uniform(-2, 2)
 
-    def clone(self, enabled):
+    def clone(self, enabled, inNode=None, outNode=None):
+        """
+        Clone the connection. Pass the matching nodes of the genome the clone belongs to as inNode and outNode, otherwise the endpoints are cloned as well.
+        """
         new = Connection(
-            self.inNode.clone(), 
-            self.outNode.clone(), 
-            copy(self.weight), 
-            innovation=copy(self.innovation)
+            inNode if inNode is not None else self.inNode.clone(),
+            outNode if outNode is not None else self.outNode.clone(),
+            self.weight,
+            innovation=self.innovation
         )
 
         new.enabled = enabled
@@ -0,0 +1,141 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+"""
+Code generation of standalone inference functions for trained genomes.
+
+The generated source is straight-line Python with the weights inlined as constants. It only needs the math module, so a winning genome can be served without NEATWrapper or NumPy:
+
+    source = exportSource(pop.getBestGene())
+    policy = compileGenome(pop.getBestGene())
+    policy.getAction(observation)
+"""
+
+# Built-in libraries
+import types
+
+# Custom libraries
+from NEATWrapper.activations import ACTIVATIONS, ACTIVATION_NAMES
+
+# * Python expression of every activation function, with {} for the argument. Add an entry to export genomes using a registered custom activation.
+EXPRESSIONS = {
+    'identity': '{}',
+    'relu': 'max({}, 0.0)',
+    'sigmoid': '0.5 * (1.0 + tanh(0.5 * ({})))',
+    'tanh': 'tanh({})'
+}
+
+def exportSource(gene):
+    """exportSource - Generates the source of a module computing the outputs of a genome.
+
+    The module defines forward(x), returning the list of output values, and getAction(x), returning the index of the largest output, the same as Genome.getAction. Only nodes that can reach an output are computed. Nodes that do not depend on the inputs are folded into constants, and every remaining node is one assignment with its weights inlined.
+
+    Args:
+        gene (Genome): The genome, or a PackedGenome.
+
+    Returns:
+        String: The Python source.
+    """
+
+    packed = gene.pack()
+    names = [ACTIVATION_NAMES[a] for a in packed.nodeActivations.tolist()]
+    for name in set(names):
+        if name not in EXPRESSIONS:
+            raise ValueError(f'No Python expression for the activation {name}, add one to EXPRESSIONS')
+
+    nodeIds = packed.nodeIds.tolist()
+    layers = packed.nodeLayers.tolist()
+    outputs = nodeIds[packed.inNodes:packed.inNodes + packed.outNodes]
+
+    incoming = {nodeId: [] for nodeId in nodeIds}
+    for inId, outId, weight, enabled in zip(packed.inIds.tolist(), packed.outIds.tolist(), packed.weights.tolist(), packed.enabled.tolist()):
+        if enabled:
+            incoming[outId].append((inId, weight))
+
+    # * Walk back from the outputs to find the nodes the outputs depend on, everything else is dead.
+    live = set(outputs)
+    stack = list(outputs)
+    while stack:
+        for inId, _ in incoming[stack.pop()]:
+            if inId not in live:
+                live.add(inId)
+                stack.append(inId)
+
+    index = {nodeId: i for i, nodeId in enumerate(nodeIds)}
+    order = sorted((nodeId for nodeId in nodeIds if nodeId in live), key=lambda nodeId: layers[index[nodeId]])
+
+    # * Every live node is either a constant (a float) or the name of a variable.
+    values = {}
+    lines = []
+    for nodeId in order:
+        i = index[nodeId]
+        if i < packed.inNodes:
+            if names[i] == 'identity':
+                values[nodeId] = f'x[{i}]'
+                continue
+            terms, constant = [f'x[{i}]'], 0.0
+        else:
+            terms, constant = [], 0.0
+            for inId, weight in incoming[nodeId]:
+                value = values[inId]
+                if isinstance(value, float):
+                    constant += value * weight
+                elif weight == 1.0:
+                    terms.append(value)
+                else:
+                    terms.append(f'{value} * {weight!r}')
+
+        if not terms:
+            values[nodeId] = float(ACTIVATIONS[names[i]](constant))
+            continue
+
+        if constant:
+            terms.append(repr(constant))
+        values[nodeId] = f'n{nodeId}'
+        lines.append(f'    n{nodeId} = ' + EXPRESSIONS[names[i]].format(' + '.join(terms)))
+
+    result = ', '.join(values[nodeId] if isinstance(values[nodeId], str) else repr(values[nodeId]) for nodeId in outputs)
+
+    return '\n'.join([
+        f'# Generated by NEATWrapper.export: {packed.inNodes} inputs, {packed.outNodes} outputs, {len(lines)} computed nodes.',
+        'from math import tanh',
+        '',
+        'def forward(x):',
+        *lines,
+        f'    return [{result}]',
+        '',
+        'def getAction(x):',
+        '    outputs = forward(x)',
+        '    return outputs.index(max(outputs))',
+        ''
+    ])
+
+def compileGenome(gene):
+    """compileGenome - Compiles the exported source of a genome into functions in this process.
+
+    Args:
+        gene (Genome): The genome, or a PackedGenome.
+
+    Returns:
+        SimpleNamespace: The forward and getAction functions, and the source they were compiled from.
+    """
+
+    source = exportSource(gene)
+    namespace = {}
+    exec(compile(source, '<NEATWrapper.export>', 'exec'), namespace)
+
+    return types.SimpleNamespace(forward=namespace['forward'], getAction=namespace['getAction'], source=source)
+
+def exportModule(gene, path):
+    """exportModule - Writes the exported source of a genome to a Python file.
+
+    Args:
+        gene (Genome): The genome, or a PackedGenome.
+        path (String): Path of the file to write.
+    """
+
+    with open(path, 'w') as f:
+        f.write(exportSource(gene))
@@ -6,15 +6,18 @@
 
 # Built-in libraries
 import random
-from copy import copy
 
 # Third-party libraries
-import networkx as nx
-import matplotlib.pyplot as plt
+import numpy as np
 
 # Custom libraries
+from NEATWrapper.activations import ACTIVATION_NAMES
 from NEATWrapper.node import Node
-from NEATWrapper.connection import Connection
+from NEATWrapper.phenotype import Phenotype
+from NEATWrapper.packed import packGenome
+
+# * Number of random pairs addConnection tries before it counts the unconnected pairs of every source.
+ADD_CONNECTION_TRIES = 8
 
 class Genome:
     """Genome - Class for a Genome in the NEAT Algorithm
@@ -27,16 +30,26 @@ class Genome:
         innovationHistory (Innovation): Innovation for all the genes in the population.
         clone (bool, optional): Defaults to False. Whether or not the gene is a clone of a previous created gene.
     """
+    __slots__ = (
+        'nodes', 'inNodes', 'outNodes', 'connectedNodes', 'connections', 'network',
+        'phenotype', 'nextNode', 'currLayer', 'layerSizes', 'maxConnections', 'steps', 'fitness'
+    )
+
+    # * Number of clones made, of Genome and PackedGenome objects, read by the profiler of Population.naturalSelection.
+    cloneCount = 0
 
     def __init__(self, _in, _out, innovationHistory, clone=False):
         self.nodes = []
         self.inNodes = _in
         self.outNodes = _out
-        self.connectedNodes = []
+        self.connectedNodes = set()
         self.connections = []
         self.network = []
+        self.phenotype = None
         self.nextNode = 1
         self.currLayer = 2
+        self.layerSizes = []
+        self.maxConnections = 0
         self.steps = 0
         self.fitness = 0
 
@@ -51,6 +64,8 @@ class Genome:
                 self.nodes.append(node)
                 self.nextNode += 1
 
+            self.layerSizes = [_in, _out]
+            self.maxConnections = _in * _out
             self.addConnection(innovationHistory)
             self.generateNet()
 
@@ -66,8 +81,8 @@ class Genome:
         for i in range(self.inNodes):
             self.nodes[i].setValue(_input[i])
 
-        for i in range(len(self.network)):
-            self.network[i].forward()
+        for node in self.getNetwork():
+            node.forward()
 
         for i in range(self.outNodes):
             output[i] = self.nodes[self.inNodes + i].value
@@ -82,94 +97,127 @@ class Genome:
             connection.inNode.addConnection(connection)
 
     def generateNet(self):
-        self.connectNodes()
-        self.network = []
+        """
+        Rebuild the network from scratch and compile the phenotype. Only needed for a genome assembled from raw nodes and connections, as the mutations keep the network up to date themselves, and clone and crossOver leave it to getNetwork
+        """
+        self.network = None
+        self.getNetwork()
+        self.countLayers()
+        self.phenotype = Phenotype(self)
 
-        for i in range(self.currLayer):
-            for j in range(len(self.nodes)):
-                if self.nodes[j].getLayer() == i:
-                    self.network.append(self.nodes[j])
+    def countLayers(self):
+        """
+        Count the nodes of every layer, and the valid connections that follow from that, from scratch
+        """
+        self.layerSizes = [0] * self.currLayer
+        for node in self.nodes:
+            self.layerSizes[node.layer] += 1
+        self.maxConnections = countPairs(self.layerSizes)
 
-    def getAction(self, _input):
-        output = self.forward(_input)
-        action = int(output.index(max(output)))
-        return action
+    def getNetwork(self):
+        """
+        Get the evaluation order of the nodes, wiring the connections to their nodes first if that has not been done yet. Clones and children start unwired, as most of them are only ever evaluated through their phenotype
+        """
+        if self.network is None:
+            self.connectNodes()
+            # * sorted is stable, so the nodes within a layer keep their order in self.nodes.
+            self.network = sorted(self.nodes, key=Node.getLayer)
 
-    def fullyConnected(self):
-        maxConnections = 0
-        nodesPerLayer = [0] * self.currLayer
+        return self.network
 
-        for node in self.nodes:
-            try:
-                nodesPerLayer[node.layer] += 1
-            except IndexError:
-                print(f'Node: {node} - currLayer: {self.currLayer}')
-                exit()
+    def getPhenotype(self):
+        """
+        Get the compiled phenotype of the genome, compiling it if the genome changed since it was last compiled
+        """
+        if self.phenotype is None:
+            self.phenotype = Phenotype(self)
 
-        for i in range(self.currLayer - 1):
-            nodesUpFront = 0
-            for j in range(i+1, self.currLayer):
-                nodesUpFront += nodesPerLayer[j]
+        return self.phenotype
 
-            maxConnections += nodesPerLayer[i] * nodesUpFront
+    def getAction(self, _input):
+        """
+        Get the action for an input, using the compiled phenotype of the genome
+        """
+        return self.getPhenotype().getAction(_input)
+
+    def forwardBatch(self, _inputs):
+        """
+        Move a batch of inputs, of shape (N, inNodes), forward through the genome. Returns the outputs as an array of shape (N, outNodes)
+        """
+        return self.getPhenotype().forwardBatch(_inputs)
 
-        if len(self.connections) == maxConnections:
-            return True
+    def getActionBatch(self, _inputs):
+        """
+        Get the actions for a batch of inputs, of shape (N, inNodes). Returns an array of shape (N,)
+        """
+        return self.getPhenotype().getActionBatch(_inputs)
 
-        return False
+    def fullyConnected(self):
+        """
+        Whether or not every valid pair of nodes is connected. maxConnections is kept up to date by addNode, so this takes constant time
+        """
+        return len(self.connectedNodes) >= self.maxConnections
 
     def addConnection(self, innovationHistory):
         """
-        Add a connection to the genome
+        Add a connection between a random valid pair of unconnected nodes. A few pairs are drawn from the possible sources and destinations first. If those are all taken, as in a nearly fully connected genome, a source is drawn weighted by its number of unconnected pairs, and then one of its unconnected destinations. Either way every valid unconnected pair is equally likely
         """
 
         if self.fullyConnected():
             return
 
-        inNode = random.randint(0, len(self.nodes)-1)
-        outNode = random.randint(0, len(self.nodes)-1)
-        
-        node1 = self.nodes[inNode]
-        node2 = self.nodes[outNode]
-        connect = (node1.nodeId, node2.nodeId)
-
-        while self.nodesAreSimilar(node1, node2) or connect in self.connectedNodes:
-            inNode = random.randint(0, len(self.nodes)-1)
-            outNode = random.randint(0, len(self.nodes)-1)
-            node1 = self.nodes[inNode]
-            node2 = self.nodes[outNode]
-            connect = (node1.nodeId, node2.nodeId)
+        # * Nodes are stored as inputs, outputs and then hidden nodes.
+        sources = self.nodes[:self.inNodes] + self.nodes[self.inNodes + self.outNodes:]
+        destinations = self.nodes[self.inNodes:]
+
+        for _ in range(ADD_CONNECTION_TRIES):
+            node1 = random.choice(sources)
+            node2 = random.choice(destinations)
+            if self.canConnect(node1, node2):
+                break
+        else:
+            # * A wired node holds its outgoing connections, and it can connect to every node in a later layer, so the unconnected pairs of every source are counted in linear time.
+            self.getNetwork()
+            later = [0] * self.currLayer
+            for layer in range(self.currLayer - 2, -1, -1):
+                later[layer] = later[layer + 1] + self.layerSizes[layer + 1]
+
+            node1 = random.choices(sources, weights=[later[node.layer] - len(node.connections) for node in sources])[0]
+            node2 = random.choice([node for node in destinations if self.canConnect(node1, node)])
 
         connection = innovationHistory.checkConnection(node1, node2)
 
-        self.nodes[inNode].isConnected = True
-        self.connectedNodes.append(connect)
+        node1.isConnected = True
+        self.connectedNodes.add((node1.nodeId, node2.nodeId))
         self.connections.append(connection)
+        self.phenotype = None
 
-        self.connectNodes()
+        # * An unwired genome gets the connection when getNetwork wires it.
+        if self.network is not None:
+            node1.addConnection(connection)
 
-    def nodesAreSimilar(self, node1, node2):
-        if node1.nodeId == node2.nodeId:
-            return True
-        if node1.nodeType == 'output':
-            return True
-        if node2.nodeType == 'input':
-            return True
-        if node1.layer == node2.layer:
-            return True
-
-        return False
+    def canConnect(self, node1, node2):
+        """
+        Whether or not a connection from node1 to node2 can be added. Connections only go forward through the layers, so the layer ordering stays a valid evaluation order
+        """
+        return node1.layer < node2.layer and (node1.nodeId, node2.nodeId) not in self.connectedNodes
 
     def addNode(self, innovationHistory):
         """
         Create a new node in the genome
         """
+        network = self.getNetwork()
         randomConnection = random.randint(0, len(self.connections)-1)
         connect = self.connections[randomConnection]
         connect.enabled = False
 
         newNodeNo = self.nextNode
         newNode = Node(newNodeNo, 'hidden', layer = connect.inNode.layer + 1)
+
+        # * The new node can connect to every node outside its layer, so count its pairs before it joins the layer.
+        layerSize = self.layerSizes[newNode.layer] if newNode.layer < connect.outNode.layer else 0
+        self.maxConnections += len(self.nodes) - layerSize
+
         self.nodes.append(newNode)
 
         newConnection1 = innovationHistory.checkConnection(
@@ -178,7 +226,7 @@ class Genome:
             weight=connect.weight
         )
         self.connections.append(newConnection1)
-        self.connectedNodes.append((
+        self.connectedNodes.add((
             newNodeNo, 
             connect.outNode.nodeId
         ))
@@ -189,63 +237,64 @@ class Genome:
             weight=1
         )
         self.connections.append(newConnection2)
-        self.connectedNodes.append((
+        self.connectedNodes.add((
             connect.inNode.nodeId, 
             newNodeNo
         ))
 
+        newNode.addConnection(newConnection1)
+        connect.inNode.addConnection(newConnection2)
+
         self.nextNode += 1
         if newNode.layer == connect.outNode.layer:
-            for node in self.nodes[:-1]:
-                if node.layer >= newNode.layer:
-                    node.layer += 1
+            # * The new node needs a layer of its own. Only the nodes from that layer on, which form the tail of the network, move up.
+            pos = insertPosition(network, newNode.layer - 1)
+            for i in range(pos, len(network)):
+                network[i].layer += 1
             self.currLayer += 1
+            self.layerSizes.insert(newNode.layer, 1)
+        else:
+            pos = insertPosition(network, newNode.layer)
+            self.layerSizes[newNode.layer] += 1
+        network.insert(pos, newNode)
 
-        self.connectNodes()
+        self.phenotype = None
 
     def crossOver(self, parent):
-        child = self.clone()
-        child.nodes = []
-        child.connections = []
-        child.connectedNodes = []
+        child = Genome(self.inNodes, self.outNodes, None, clone=True)
+        child.nodes = [node.clone() for node in self.nodes]
+        child.nextNode = self.nextNode
+        child.currLayer = self.currLayer
+        child.layerSizes = list(self.layerSizes)
+        child.maxConnections = self.maxConnections
+        nodes = {node.nodeId: node for node in child.nodes}
+
+        parentConnections = {}
+        for connection in parent.connections:
+            parentConnections.setdefault(connection.innovation, connection)
 
         for connection in self.connections:
             enabled = True
-            result = self.searchConnection(
-                parent.connections, 
-                connection.innovation
-            )
+            result = parentConnections.get(connection.innovation)
 
             if result:
                 if not connection.enabled or not result.enabled:
                     if random.random() < 0.75:
                         enabled = False
 
-                if random.random() < 0.5:
-                    child.connections.append(connection.clone(enabled))
-                    child.connectedNodes.append((
-                        connection.inNode.nodeId, 
-                        connection.outNode.nodeId
-                    ))
-                else:
-                    child.connections.append(result.clone(enabled))
-                    child.connectedNodes.append((
-                        result.inNode.nodeId, 
-                        result.outNode.nodeId
-                    ))
-
+                gene = connection if random.random() < 0.5 else result
             else:
-                child.connections.append(connection.clone(connection.enabled))
-                child.connectedNodes.append((
-                        connection.inNode.nodeId, 
-                        connection.outNode.nodeId
-                ))
+                gene = connection
+                enabled = connection.enabled
 
-        child.nodes = [node.clone() for node in self.nodes]
+            inNode = nodes[gene.inNode.nodeId]
+            outNode = nodes[gene.outNode.nodeId]
+            child.connections.append(gene.clone(enabled, inNode, outNode))
+            child.connectedNodes.add((inNode.nodeId, outNode.nodeId))
 
-        child.connectNodes()
+        child.network = None
         return child
-                
+
     def getNode(self, nodeId):
         for node in self.nodes:
             if node.nodeId == nodeId:
@@ -259,25 +308,60 @@ class Genome:
 
         return None
 
+    def getGeneArrays(self):
+        """
+        Get the innovation numbers and weights of all connections, as two arrays sorted by innovation number
+        """
+        innovations = np.array([connection.innovation for connection in self.connections], dtype=np.int64)
+        weights = np.array([connection.weight for connection in self.connections], dtype=float)
+        order = np.argsort(innovations, kind='mergesort')
+
+        return innovations[order], weights[order]
+
+    def getConnectionIds(self):
+        """
+        Get the (inId, outId) node id pair of every connection
+        """
+        return [(connection.inNode.nodeId, connection.outNode.nodeId) for connection in self.connections]
+
+    def pack(self):
+        """
+        Get an array backed copy of the genome, see PackedGenome
+        """
+        return packGenome(self)
+
     def clear(self):
         self.steps = 0
         self.fitness = 0
 
     def clone(self):
+        """
+        Clone the genome. The connections of the clone refer to the clone's own nodes, and the immutable values (ids, weights and the compiled phenotype) are shared rather than copied. The clone is left unwired, see getNetwork
+        """
         clone = Genome(self.inNodes, self.outNodes, None, clone=True)
-        clone.connections = [connection.clone(connection.enabled) for connection in self.connections]
-        clone.connectedNodes = [(copy(conn[0]), copy(conn[1])) for conn in self.connectedNodes]
         clone.nodes = [node.clone() for node in self.nodes]
-        clone.nextNode = copy(self.nextNode)
-        clone.currLayer = copy(self.currLayer)
+        nodes = {node.nodeId: node for node in clone.nodes}
+        clone.connections = [
+            connection.clone(connection.enabled, nodes[connection.inNode.nodeId], nodes[connection.outNode.nodeId])
+            for connection in self.connections
+        ]
+        clone.network = None
+        clone.connectedNodes = set(self.connectedNodes)
+        clone.nextNode = self.nextNode
+        clone.currLayer = self.currLayer
+        clone.layerSizes = list(self.layerSizes)
+        clone.maxConnections = self.maxConnections
+        clone.phenotype = self.phenotype
+        Genome.cloneCount += 1
         return clone
-    
+
     def mutate(self, innovationHistory):
         """
-        Mutates the genome in one of three ways
+        Mutates the genome in one of four ways
         1) Weight mutation
         2) Add random connection
         3) Add new node
+        4) Change the activation function of a node
         """
 
         r = random.random()
@@ -285,6 +369,7 @@ class Genome:
             # 80 % of the time do weight mutation
             for connection in self.connections:
                 connection.mutateWeights()
+            self.phenotype = None
 
         r2 = random.random()
         if r2 < 0.05:
@@ -296,7 +381,24 @@ class Genome:
             # 2 % of the time add a new node
             self.addNode(innovationHistory)
 
+        r4 = random.random()
+        if r4 < 0.02:
+            # 2 % of the time change an activation function
+            self.mutateActivation()
+
+    def mutateActivation(self):
+        """
+        Give a random hidden or output node a random activation function from the registry
+        """
+        node = random.choice(self.nodes[self.inNodes:])
+        node.activation = random.choice(ACTIVATION_NAMES)
+        self.phenotype = None
+
     def drawGenome(self):
+        # * Only needed for drawing, so they are imported here to keep importing NEATWrapper fast.
+        import networkx as nx
+        import matplotlib.pyplot as plt
+
         G = nx.Graph()
         for i in range(len(self.nodes)):
             G.add_node(i+1, data=self.nodes[i])
@@ -341,6 +443,28 @@ class Genome:
             self.connections
         ) 
 
+def countPairs(layerSizes):
+    """
+    Count the valid connections of a genome with the given number of nodes per layer: every pair of nodes in different layers, going forward
+    """
+    nodes = sum(layerSizes)
+
+    return (nodes * nodes - sum(size * size for size in layerSizes)) // 2
+
+def insertPosition(network, layer):
+    """
+    Binary search the network, which is ordered by layer, for the index of the first node in a layer above the given one
+    """
+    lo, hi = 0, len(network)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if network[mid].layer > layer:
+            hi = mid
+        else:
+            lo = mid + 1
+
+    return lo
+
 def translate(value, leftMin, leftMax, rightMin, rightMax):
     # Figure out how 'wide' each range is
     leftSpan = leftMax - leftMin
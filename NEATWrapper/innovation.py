@@ -5,39 +5,119 @@
 # ================================
 
 # Built-in Libraries
-from copy import deepcopy
 import random
+import sys
+
+# Third-party libraries
+import numpy as np
 
 # Custom Libraries
 from NEATWrapper.connection import Connection
 
 class Innovation:
     """
-    Class to store innovations in the NEAT Algorithm
+    Class to store innovations in the NEAT Algorithm. The history maps (inId, outId) node id pairs to innovation numbers.
+    @param pruneAfter: int, number of generations an entry may be absent from every living genome before prune evicts it. Optional, defaults to None (never evict)
     """
-    def __init__(self):
-        self.connectionsDone = []
+    def __init__(self, pruneAfter=None):
+        self.connectionsDone = {}
         self.innoNo = 1
+        self.pruneAfter = pruneAfter
+        self.generation = 0
+        self.lastSeen = {}
+
+    def getInnovation(self, inId, outId):
+        """getInnovation - Finds the innovation number of a connection between two node ids.
+
+        The history is keyed by (inId, outId), so looking up a known connection is a single dict lookup. A connection not seen before gets the next innovation number.
+
+        Args:
+            inId (Int): Id of the node the connection flows from.
+            outId (Int): Id of the node the connection flows to.
+
+        Returns:
+            Int: The innovation number of the connection.
+        """
+
+        key = (inId, outId)
+        inno = self.connectionsDone.get(key)
+        if inno is None:
+            inno = self.innoNo
+            self.connectionsDone[key] = inno
+            self.innoNo += 1
+            if self.pruneAfter is not None:
+                self.lastSeen[key] = self.generation
+
+        return inno
 
     def checkConnection(self, node1, node2, weight=None):
-        newConnection = Connection(node1,
+        return Connection(node1,
             node2,
-            weight=weight if weight else random.uniform(-2, 2)
+            weight=weight if weight else random.uniform(-2, 2),
+            innovation=self.getInnovation(node1.nodeId, node2.nodeId)
         )
-        gotInnovation = False
-        for connection in self.connectionsDone:
-            if connection == newConnection:
-                inno = connection.getInnovationNo()
-                newConnection.setInnovationNo(deepcopy(inno))
-                gotInnovation = True
-                break
-
-        if not gotInnovation:
-            newConnection.setInnovationNo(deepcopy(self.innoNo))
-            self.connectionsDone.append(newConnection)
-            self.innoNo += 1
 
-        return newConnection
+    def reconcile(self, packed):
+        """reconcile - Renumbers the connections of a packed genome that was bred against another history.
+
+        Every connection gets the innovation number of its (in, out) node id pair in this history, and pairs this history has not seen get new numbers in connection order. Connections matching ones already in this history line up in speciation and crossover.
+
+        Args:
+            packed (PackedGenome): The genome. Its innovation numbers are changed in place.
+
+        Returns:
+            PackedGenome: The same genome.
+        """
+
+        packed.innovations = np.array([
+            self.getInnovation(inId, outId)
+            for inId, outId in zip(packed.inIds.tolist(), packed.outIds.tolist())
+        ], dtype=np.int64)
+
+        return packed
+
+    def prune(self, genes):
+        """prune - Marks the connections of the living genomes as seen this generation, and evicts the entries not seen for pruneAfter generations.
+
+        Innovation numbers are never reused, so an evicted connection that is bred again later gets a new number instead of clashing with another one. Does nothing if pruneAfter is None.
+
+        Args:
+            genes (list): All living genomes (Genome or PackedGenome), i.e. the population, the species champions and the best gene.
+
+        Returns:
+            Int: The number of entries evicted.
+        """
+
+        if self.pruneAfter is None:
+            return 0
+
+        self.generation += 1
+        for gene in genes:
+            for key in gene.getConnectionIds():
+                self.lastSeen[key] = self.generation
+
+        # * Entries without a mark (e.g. restored from a checkpoint) count as seen now.
+        cutoff = self.generation - self.pruneAfter
+        dead = [key for key in self.connectionsDone if self.lastSeen.setdefault(key, self.generation) <= cutoff]
+        for key in dead:
+            del self.connectionsDone[key]
+            del self.lastSeen[key]
+
+        return len(dead)
+
+    def memoryFootprint(self):
+        """memoryFootprint - Estimates the memory held by the history.
+
+        Returns:
+            Dict: The number of entries and the bytes held by the dicts, their key tuples and the ints in them.
+        """
+
+        nbytes = sys.getsizeof(self.connectionsDone) + sys.getsizeof(self.lastSeen)
+        for (inId, outId), inno in self.connectionsDone.items():
+            nbytes += sys.getsizeof((inId, outId)) + sys.getsizeof(inId) + sys.getsizeof(outId) + sys.getsizeof(inno)
+        nbytes += sum(sys.getsizeof(generation) for generation in self.lastSeen.values())
+
+        return {'entries': len(self.connectionsDone), 'bytes': nbytes}
 
     def size(self):
         return len(self.connectionsDone)
@@ -0,0 +1,313 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# Built-in libraries
+import multiprocessing
+import queue
+import random
+import threading
+import time
+import traceback
+from multiprocessing.connection import Listener, Client
+
+# Third-party libraries
+import numpy as np
+
+# Custom libraries
+from NEATWrapper.population import Population
+
+# * Seconds Islands.run waits for a result before it checks whether the island processes are still alive.
+POLL_INTERVAL = 1.0
+
+class LocalTransport:
+    """LocalTransport - Sends migrants between islands on the same machine through one queue per island.
+
+    Create it before the island processes are started, so they inherit the queues.
+
+    Args:
+        islands (Int): Number of islands.
+    """
+
+    def __init__(self, islands):
+        self.queues = [multiprocessing.Queue() for _ in range(islands)]
+
+    def open(self, index):
+        pass
+
+    def send(self, dest, message):
+        self.queues[dest].put(message)
+
+    def receive(self, index):
+        return self.queues[index].get()
+
+    def close(self):
+        pass
+
+class SocketTransport:
+    """SocketTransport - Sends migrants between islands over multiprocessing.connection sockets, so the islands can run on different machines.
+
+    Every island listens on its own address. A message is sent from a background thread, as connecting blocks until the receiving island accepts, and all islands send before they receive. A send that fails is raised by the next call to send, receive or close of the island. Messages are pickled, so only share the authkey with trusted islands.
+
+    Args:
+        addresses (list): The (host, port) address of every island.
+        authkey (bytes): Key used to authenticate the connections.
+        retries (Int, optional): Defaults to 100. Number of times to try to connect to an island that is not listening yet.
+        delay (Float, optional): Defaults to 0.1. Seconds to wait between two tries.
+    """
+
+    def __init__(self, addresses, authkey, retries=100, delay=0.1):
+        self.addresses = [tuple(address) for address in addresses]
+        self.authkey = authkey
+        self.retries = retries
+        self.delay = delay
+        self.listener = None
+        self.senders = []
+        self.errors = []
+
+    def open(self, index):
+        """open - Starts listening on the address of an island. Called once, in the process of the island.
+
+        Args:
+            index (Int): Index of the island.
+        """
+
+        self.listener = Listener(self.addresses[index], authkey=self.authkey)
+
+    def send(self, dest, message):
+        self.raiseErrors()
+        thread = threading.Thread(target=self._send, args=(dest, message))
+        thread.daemon = True
+        thread.start()
+        self.senders.append(thread)
+
+    def _send(self, dest, message):
+        # * An exception would die with the thread, so it is kept for the island's own thread to raise.
+        try:
+            for _ in range(self.retries):
+                try:
+                    conn = Client(self.addresses[dest], authkey=self.authkey)
+                    break
+                except ConnectionRefusedError:
+                    time.sleep(self.delay)
+            else:
+                raise ConnectionRefusedError(f'Island {dest} at {self.addresses[dest]} is not listening')
+
+            with conn:
+                conn.send(message)
+        except Exception as error:
+            self.errors.append(error)
+
+    def receive(self, index):
+        self.raiseErrors()
+        with self.listener.accept() as conn:
+            return conn.recv()
+
+    def raiseErrors(self):
+        if self.errors:
+            raise self.errors.pop(0)
+
+    def close(self):
+        for thread in self.senders:
+            thread.join()
+        self.senders = []
+        if self.listener is not None:
+            self.listener.close()
+            self.listener = None
+        self.raiseErrors()
+
+class Islands:
+    """Islands - Island model NEAT, where several populations evolve in their own processes and exchange their best genomes.
+
+    Every island is a Population that evolves independently. Every interval generations, each island sends its best genomes to the next island in a ring and replaces its own worst genomes with the ones it receives, before selection, so the migrants compete with the reward they got on their own island. Migrants travel as PackedGenome, and their innovation numbers are reconciled with the receiving island's history, see migrate.
+
+    Args:
+        islands (Int): Number of islands, each run in its own process.
+        pop_size (Int): Size of the population of every island.
+        _inSize (Int): Number of input nodes of every gene.
+        _outSize (Int): Number of output nodes of every gene.
+        fitness (function, optional): Defaults to syntheticFitness. Takes a gene and returns its reward. It must be picklable, i.e. a module level function.
+        interval (Int, optional): Defaults to 5. Number of generations between two migrations.
+        migrants (Int, optional): Defaults to 2. Number of genomes every island sends per migration.
+        transport (optional): Defaults to a LocalTransport. The transport the migrants are sent over.
+        seed (Int, optional): Defaults to 0. Island i seeds its random generators with seed + i.
+    """
+
+    def __init__(self, islands, pop_size, _inSize, _outSize, fitness=None, interval=5, migrants=2, transport=None, seed=0):
+        self.islands = islands
+        self.pop_size = pop_size
+        self.inSize = _inSize
+        self.outSize = _outSize
+        self.fitness = fitness or syntheticFitness
+        self.interval = interval
+        self.migrants = migrants
+        self.transport = transport or LocalTransport(islands)
+        self.seed = seed
+        self.results = []
+
+    def run(self, generations):
+        """run - Evolves all islands for a number of generations.
+
+        If an island fails, or its process dies, the other islands are terminated, as they would wait for its migrants forever.
+
+        Args:
+            generations (Int): Number of generations.
+
+        Raises:
+            RuntimeError: An island raised an exception or exited without a result.
+
+        Returns:
+            list: The result of every island, see runIsland, in island order.
+        """
+
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=_runIsland, args=(
+                results, i, self.islands, self.pop_size, self.inSize, self.outSize, self.fitness,
+                generations, self.interval, self.migrants, self.transport, self.seed + i
+            ))
+            for i in range(self.islands)
+        ]
+        for process in processes:
+            process.start()
+
+        # * Read the results before joining, a process does not exit while its queue has unread data.
+        received = {}
+        try:
+            while len(received) < len(processes):
+                try:
+                    result = results.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    dead = [i for i, process in enumerate(processes) if i not in received and not process.is_alive()]
+                    if not dead:
+                        continue
+                    # * The island may have put its result just before it exited, so look once more.
+                    try:
+                        result = results.get(timeout=POLL_INTERVAL)
+                    except queue.Empty:
+                        raise RuntimeError(f'Island {dead[0]} exited with code {processes[dead[0]].exitcode} without a result')
+
+                if 'error' in result:
+                    raise RuntimeError(f'Island {result["index"]} failed:\n{result["error"]}')
+                received[result['index']] = result
+        finally:
+            for process in processes:
+                if process.is_alive() and len(received) < len(processes):
+                    process.terminate()
+                process.join()
+
+        self.results = [received[i] for i in range(len(processes))]
+
+        return self.results
+
+    def getBestGene(self):
+        """getBestGene - Gets the best gene found by any of the islands in the last run.
+
+        Returns:
+            Genome: The gene.
+        """
+
+        best = max(self.results, key=lambda result: result['bestScore'])
+
+        return best['best'].unpack()
+
+def runIsland(index, islands, pop_size, _inSize, _outSize, fitness, generations, interval, migrants, transport, seed=0):
+    """runIsland - Evolves one island, migrating with its neighbours in the ring every interval generations.
+
+    Islands runs every island in a process of its own, but this can also be started directly on each machine of a cluster, with a SocketTransport.
+
+    Args:
+        index (Int): Index of this island.
+        islands (Int): Number of islands.
+        pop_size (Int): Size of the population.
+        _inSize (Int): Number of input nodes of every gene.
+        _outSize (Int): Number of output nodes of every gene.
+        fitness (function): Takes a gene and returns its reward.
+        generations (Int): Number of generations.
+        interval (Int): Number of generations between two migrations.
+        migrants (Int): Number of genomes sent per migration.
+        transport: The transport to send the migrants over.
+        seed (Int, optional): Defaults to 0. Seed of the random generators.
+
+    Returns:
+        dict: The index of the island, its best score, its best gene as a PackedGenome and the best reward of every generation.
+    """
+
+    random.seed(seed)
+    np.random.seed(seed)
+    transport.open(index)
+    pop = Population(pop_size, _inSize, _outSize)
+    history = []
+
+    try:
+        for generation in range(1, generations + 1):
+            for gene in pop.population:
+                gene.steps = fitness(gene)
+            history.append(max(gene.steps for gene in pop.population))
+
+            if islands > 1 and generation % interval == 0:
+                best = sorted(pop.population, key=lambda gene: gene.steps, reverse=True)[:migrants]
+                transport.send((index + 1) % islands, [gene.pack() for gene in best])
+                migrate(pop, transport.receive(index))
+
+            pop.naturalSelection()
+    finally:
+        transport.close()
+
+    return {
+        'index': index,
+        'bestScore': pop.getBestScore(),
+        'best': pop.getBestGene().pack(),
+        'history': history
+    }
+
+def _runIsland(results, index, *args):
+    # * Always put a result, Islands.run waits for one from every island.
+    try:
+        results.put(runIsland(index, *args))
+    except Exception:
+        results.put({'index': index, 'error': traceback.format_exc()})
+
+def migrate(population, packedGenes):
+    """migrate - Replaces the worst genes of an evaluated population with migrants from another island.
+
+    Call it after the genes are evaluated and before naturalSelection. The migrants keep the reward they got on their own island, so they take part in the selection like any other gene. The innovation numbers of the migrants come from the history of the island they were bred on, so they are renumbered with the receiving population's history, see Innovation.reconcile.
+
+    Args:
+        population (Population): The receiving population.
+        packedGenes (list): The migrants, as PackedGenome objects. Their innovation numbers are changed in place.
+    """
+
+    history = population.innovationHistory
+    genes = [population.fromPacked(history.reconcile(packed)) for packed in packedGenes]
+
+    worst = sorted(range(len(population.population)), key=lambda i: population.population[i].steps)
+    for i, gene in zip(worst, genes):
+        population.population[i] = gene
+    population.phenotype = None
+
+# * Fixed observations of syntheticFitness, the same in every process.
+_observations = {}
+
+def syntheticFitness(gene):
+    """syntheticFitness - Deterministic stand-in for an environment, used to run islands without gym.
+
+    The gene sees 16 fixed random observations, and the target action for an observation is the number of its positive inputs modulo the number of outputs.
+
+    Args:
+        gene (Genome): The gene.
+
+    Returns:
+        Int: One plus the number of observations the gene picks the target action for.
+    """
+
+    key = (gene.inNodes, gene.outNodes)
+    if key not in _observations:
+        observations = np.random.RandomState(0).uniform(-1, 1, size=(16, gene.inNodes))
+        targets = (observations > 0).sum(axis=1) % gene.outNodes
+        _observations[key] = (observations, targets)
+    observations, targets = _observations[key]
+
+    return 1 + int((gene.getActionBatch(observations) == targets).sum())
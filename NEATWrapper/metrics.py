@@ -0,0 +1,112 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# Built-in libraries
+import json
+
+# Third-party libraries
+import numpy as np
+
+# Custom libraries
+from NEATWrapper.packed import PackedGenome
+
+class JSONLSink:
+    """JSONLSink - Metrics sink writing every record as one JSON line to a file.
+
+    Sinks are plain callables taking one record (a dict), so any function can be used as a callback sink next to this one.
+
+    Args:
+        path (String): File to append the records to.
+        flush (bool, optional): Defaults to True. Whether or not to flush the file after every record.
+    """
+
+    def __init__(self, path, flush=True):
+        self.file = open(path, 'a')
+        self.flush = flush
+
+    def __call__(self, record):
+        self.file.write(json.dumps(record) + '\n')
+        if self.flush:
+            self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+def stats(values):
+    """stats - Summary statistics of a list of numbers.
+
+    Args:
+        values (list): The numbers.
+
+    Returns:
+        Dict: The mean, standard deviation, minimum and maximum.
+    """
+
+    values = np.asarray(values, dtype=float)
+
+    return {
+        'mean': float(values.mean()),
+        'std': float(values.std()),
+        'min': float(values.min()),
+        'max': float(values.max())
+    }
+
+def generationRecord(generation, steps, genes):
+    """generationRecord - Builds the metrics record of one generation, from its evaluated genes.
+
+    Args:
+        generation (Int): The number of the generation.
+        steps (list): The reward of every gene.
+        genes (list): The evaluated Genome or PackedGenome objects.
+
+    Returns:
+        Dict: The record. The caller adds the values known after selection, like species and innovations.
+    """
+
+    sizes = [geneSizes(gene) for gene in genes]
+
+    return {
+        'type': 'generation',
+        'generation': generation,
+        'genomes': len(genes),
+        'reward': stats(steps),
+        'nodes': stats([nodes for nodes, _, _ in sizes]),
+        'connections': stats([connections for _, connections, _ in sizes]),
+        'enabledConnections': stats([enabled for _, _, enabled in sizes])
+    }
+
+def genomeRecord(generation, index, reward, gene):
+    """genomeRecord - Builds the metrics record of one evaluated gene.
+
+    Args:
+        generation (Int): The number of the generation.
+        index (Int): Position of the gene in the population.
+        reward (Float): The reward of the gene.
+        gene (Genome): The gene, or a PackedGenome.
+
+    Returns:
+        Dict: The record.
+    """
+
+    nodes, connections, _ = geneSizes(gene)
+
+    return {
+        'type': 'genome',
+        'generation': generation,
+        'index': index,
+        'reward': float(reward),
+        'nodes': nodes,
+        'connections': connections
+    }
+
+def geneSizes(gene):
+    """
+    Get the number of nodes, connections and enabled connections of a Genome or PackedGenome
+    """
+    if isinstance(gene, PackedGenome):
+        return len(gene.nodeIds), len(gene.innovations), int(np.count_nonzero(gene.enabled))
+
+    return len(gene.nodes), len(gene.connections), sum(1 for c in gene.connections if c.enabled)
@@ -4,16 +4,20 @@
 # Project: NEAT
 # ================================
 
-from copy import deepcopy
+# Custom libraries
+from NEATWrapper.activations import SCALAR_ACTIVATIONS, defaultActivation
 
 class Node:
     """
-    Class for a Node in the NEAT Algorithm
+    Class for a Node in the NEAT Algorithm. The activation is the name of a function in NEATWrapper.activations, and defaults to identity for input nodes and relu for the others
     """
-    def __init__(self, _id, _type, layer = 0):
+    __slots__ = ('nodeId', 'nodeType', 'layer', 'activation', 'isConnected', 'connections', 'value')
+
+    def __init__(self, _id, _type, layer = 0, activation = None):
         self.nodeId = _id
         self.nodeType = _type
         self.layer = layer
+        self.activation = activation or defaultActivation(_type)
         self.isConnected = False
         self.connections = []
         self.value = 0
@@ -31,6 +35,8 @@ class Node:
         return self.layer
 
     def forward(self):
+        # * All incoming connections have been summed by now, so the activation is applied once before the value is passed on.
+        self.value = SCALAR_ACTIVATIONS[self.activation](self.value)
         for connection in self.connections:
             connection.forward()
 
@@ -38,16 +44,9 @@ class Node:
         self.value = val
 
     def clone(self):
-        new = Node(
-            deepcopy(self.nodeId), 
-            deepcopy(self.nodeType), 
-            deepcopy(self.layer)
-        )
-
-        # for connection in self.connections:
-        #     new.addConnection(connection.clone(connection.enabled))
-
-        new.isConnected = deepcopy(self.isConnected)
+        # * The id, type and layer are immutable values, so the clone can share them.
+        new = Node(self.nodeId, self.nodeType, self.layer, self.activation)
+        new.isConnected = self.isConnected
 
         return new
 
@@ -55,4 +54,4 @@ class Node:
         return ((self.nodeType, self.nodeId, self.layer) == (other.nodeType, other.nodeId, other.layer))
 
     def __repr__(self):
-        return f'Node: ID - {self.nodeId}, Type - {self.nodeType}, Layer - {self.layer}'
\ No newline at end of file
+        return f'Node: ID - {self.nodeId}, Type - {self.nodeType}, Layer - {self.layer}, Activation - {self.activation}'
\ No newline at end of file
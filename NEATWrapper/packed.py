@@ -0,0 +1,298 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# Third-party libraries
+import numpy as np
+
+# Custom libraries
+from NEATWrapper.activations import ACTIVATION_NAMES, defaultActivation
+from NEATWrapper.node import Node
+from NEATWrapper.connection import Connection
+from NEATWrapper.phenotype import Phenotype
+
+NODE_TYPES = ('input', 'output', 'hidden')
+
+class PackedGenome:
+    """PackedGenome - Array backed storage of a Genome.
+
+    Stores a genome as parallel arrays instead of Node and Connection objects: node id, type, layer and activation arrays, and innovation, in/out node id, weight and enabled arrays for the connections. This is a few ints and floats per gene, it clones with plain buffer copies and it pickles compactly, so it is the form genomes are stored, shipped and checkpointed in, and the form a Population with packed=True keeps them in between generations. It evaluates, clones and speciates like a Genome. Use Genome.pack to create one and unpack to get a Genome back for mutation and crossover.
+
+    Args:
+        inNodes (Int): Number of input nodes.
+        outNodes (Int): Number of output nodes.
+        nodeIds (np.ndarray): Id of every node.
+        nodeTypes (np.ndarray): Type of every node, as an index into NODE_TYPES.
+        nodeLayers (np.ndarray): Layer of every node.
+        innovations (np.ndarray): Innovation number of every connection.
+        inIds (np.ndarray): Id of the node every connection flows from.
+        outIds (np.ndarray): Id of the node every connection flows to.
+        weights (np.ndarray): Weight of every connection.
+        enabled (np.ndarray): Whether every connection is enabled.
+        nextNode (Int): Id the next new node gets.
+        currLayer (Int): Number of layers in the genome.
+        nodeActivations (np.ndarray, optional): Defaults to the default activation of every node type. Activation of every node, as an index into ACTIVATION_NAMES.
+    """
+
+    def __init__(self, inNodes, outNodes, nodeIds, nodeTypes, nodeLayers, innovations, inIds, outIds, weights, enabled, nextNode, currLayer, nodeActivations=None):
+        self.inNodes = inNodes
+        self.outNodes = outNodes
+        self.nodeIds = np.asarray(nodeIds, dtype=np.int32)
+        self.nodeTypes = np.asarray(nodeTypes, dtype=np.int8)
+        self.nodeLayers = np.asarray(nodeLayers, dtype=np.int32)
+        self.innovations = np.asarray(innovations, dtype=np.int64)
+        self.inIds = np.asarray(inIds, dtype=np.int32)
+        self.outIds = np.asarray(outIds, dtype=np.int32)
+        self.weights = np.asarray(weights, dtype=float)
+        self.enabled = np.asarray(enabled, dtype=bool)
+        if nodeActivations is None:
+            nodeActivations = [ACTIVATION_NAMES.index(defaultActivation(NODE_TYPES[t])) for t in self.nodeTypes]
+        self.nodeActivations = np.asarray(nodeActivations, dtype=np.int8)
+        self.nextNode = nextNode
+        self.currLayer = currLayer
+        self.steps = 0
+        self.fitness = 0
+        self.phenotype = None
+
+    def pack(self):
+        return self
+
+    def unpack(self):
+        """unpack - Builds a Genome with Node and Connection objects from the arrays.
+
+        The connections refer to the nodes of the new genome. The genome shares the compiled phenotype, if there is one, and its network is left for Genome.getNetwork to build when needed, so unpacking a parent for breeding does not compile anything.
+
+        Returns:
+            Genome: The unpacked genome.
+        """
+
+        # * Imported here, as the genome module packs itself with this module.
+        from NEATWrapper.genome import Genome
+
+        gene = Genome(self.inNodes, self.outNodes, None, clone=True)
+        gene.nodes = [
+            Node(int(nodeId), NODE_TYPES[nodeType], layer=int(layer), activation=ACTIVATION_NAMES[activation])
+            for nodeId, nodeType, layer, activation in zip(self.nodeIds, self.nodeTypes, self.nodeLayers, self.nodeActivations)
+        ]
+        nodes = {node.nodeId: node for node in gene.nodes}
+
+        for inno, inId, outId, weight, enabled in zip(self.innovations.tolist(), self.inIds.tolist(), self.outIds.tolist(), self.weights.tolist(), self.enabled.tolist()):
+            connection = Connection(nodes[inId], nodes[outId], weight, innovation=inno)
+            connection.enabled = enabled
+            nodes[inId].isConnected = True
+            gene.connections.append(connection)
+            gene.connectedNodes.add((inId, outId))
+
+        gene.nextNode = self.nextNode
+        gene.currLayer = self.currLayer
+        gene.steps = self.steps
+        gene.fitness = self.fitness
+        gene.network = None
+        gene.countLayers()
+        gene.phenotype = self.phenotype
+
+        return gene
+
+    def clone(self):
+        """clone - Copies the genome with plain buffer copies of the arrays. Counted in Genome.cloneCount like the clones of a Genome.
+
+        Returns:
+            PackedGenome: The copy.
+        """
+
+        from NEATWrapper.genome import Genome
+
+        Genome.cloneCount += 1
+        clone = PackedGenome(
+            self.inNodes,
+            self.outNodes,
+            self.nodeIds.copy(),
+            self.nodeTypes.copy(),
+            self.nodeLayers.copy(),
+            self.innovations.copy(),
+            self.inIds.copy(),
+            self.outIds.copy(),
+            self.weights.copy(),
+            self.enabled.copy(),
+            self.nextNode,
+            self.currLayer,
+            self.nodeActivations.copy()
+        )
+        clone.phenotype = self.phenotype
+
+        return clone
+
+    def getGeneArrays(self):
+        """getGeneArrays - Gets the innovation numbers and weights of all connections, sorted by innovation number.
+
+        Returns:
+            Tuple: The sorted innovation numbers and the matching weights.
+        """
+
+        order = np.argsort(self.innovations, kind='mergesort')
+
+        return self.innovations[order], self.weights[order]
+
+    def getConnectionIds(self):
+        """getConnectionIds - Gets the (inId, outId) node id pair of every connection.
+
+        Returns:
+            List: The pairs, in connection order.
+        """
+
+        return list(zip(self.inIds.tolist(), self.outIds.tolist()))
+
+    def forward(self, _input):
+        return list(self.getPhenotype().forward(_input))
+
+    def getAction(self, _input):
+        return self.getPhenotype().getAction(_input)
+
+    def forwardBatch(self, _inputs):
+        return self.getPhenotype().forwardBatch(_inputs)
+
+    def getActionBatch(self, _inputs):
+        return self.getPhenotype().getActionBatch(_inputs)
+
+    def getPhenotype(self):
+        """getPhenotype - Gets the compiled phenotype of the genome, compiling it on first use.
+
+        Returns:
+            Phenotype: The compiled network.
+        """
+
+        if self.phenotype is None:
+            self.phenotype = Phenotype(self)
+
+        return self.phenotype
+
+    def drawGenome(self):
+        self.unpack().drawGenome()
+
+    def nbytes(self):
+        """nbytes - Number of bytes held by the arrays of the genome.
+
+        Returns:
+            Int: The size of the arrays in bytes.
+        """
+
+        return sum(a.nbytes for a in (
+            self.nodeIds, self.nodeTypes, self.nodeLayers, self.nodeActivations,
+            self.innovations, self.inIds, self.outIds, self.weights, self.enabled
+        ))
+
+    def __repr__(self):
+        return "PackedGenome: \n===> Nodes - {}, \n===> connections - {}".format(
+            len(self.nodeIds),
+            len(self.innovations)
+        )
+
+def packGenome(gene):
+    """packGenome - Packs a Genome into a PackedGenome.
+
+    Args:
+        gene (Genome): The genome to pack.
+
+    Returns:
+        PackedGenome: The array backed copy of the genome.
+    """
+
+    packed = PackedGenome(
+        gene.inNodes,
+        gene.outNodes,
+        [node.nodeId for node in gene.nodes],
+        [NODE_TYPES.index(node.nodeType) for node in gene.nodes],
+        [node.layer for node in gene.nodes],
+        [connection.innovation for connection in gene.connections],
+        [connection.inNode.nodeId for connection in gene.connections],
+        [connection.outNode.nodeId for connection in gene.connections],
+        [connection.weight for connection in gene.connections],
+        [connection.enabled for connection in gene.connections],
+        gene.nextNode,
+        gene.currLayer,
+        [ACTIVATION_NAMES.index(node.activation) for node in gene.nodes]
+    )
+    packed.steps = gene.steps
+    packed.fitness = gene.fitness
+    packed.phenotype = gene.phenotype
+
+    return packed
+
+def concatenatePacked(genes):
+    """concatenatePacked - Concatenates many packed genomes into one set of flat arrays.
+
+    The node and connection arrays of all genomes are concatenated, with offset arrays marking where each genome starts, and the per genome values are gathered into arrays of their own. This is the layout used to store or ship many genomes at once.
+
+    Args:
+        genes (list): List of PackedGenome (or Genome) objects.
+
+    Returns:
+        Dict: Name -> np.ndarray with the flat arrays.
+    """
+
+    genes = [gene.pack() for gene in genes]
+
+    def join(name, dtype):
+        parts = [getattr(gene, name) for gene in genes]
+        return np.concatenate(parts).astype(dtype, copy=False) if parts else np.zeros(0, dtype=dtype)
+
+    return {
+        'inNodes': np.array([gene.inNodes for gene in genes], dtype=np.int32),
+        'outNodes': np.array([gene.outNodes for gene in genes], dtype=np.int32),
+        'nextNode': np.array([gene.nextNode for gene in genes], dtype=np.int64),
+        'currLayer': np.array([gene.currLayer for gene in genes], dtype=np.int32),
+        'steps': np.array([gene.steps for gene in genes], dtype=float),
+        'fitness': np.array([gene.fitness for gene in genes], dtype=float),
+        'nodeOffsets': np.cumsum([0] + [len(gene.nodeIds) for gene in genes]).astype(np.int64),
+        'nodeIds': join('nodeIds', np.int32),
+        'nodeTypes': join('nodeTypes', np.int8),
+        'nodeLayers': join('nodeLayers', np.int32),
+        'nodeActivations': join('nodeActivations', np.int8),
+        'connectionOffsets': np.cumsum([0] + [len(gene.innovations) for gene in genes]).astype(np.int64),
+        'innovations': join('innovations', np.int64),
+        'inIds': join('inIds', np.int32),
+        'outIds': join('outIds', np.int32),
+        'weights': join('weights', float),
+        'enabled': join('enabled', bool),
+    }
+
+def splitPacked(arrays):
+    """splitPacked - Splits flat arrays made by concatenatePacked back into packed genomes.
+
+    The genomes get views into the given arrays, so arrays loaded with memory mapping are not copied.
+
+    Args:
+        arrays (dict): Name -> np.ndarray with the flat arrays.
+
+    Returns:
+        List: The PackedGenome objects.
+    """
+
+    genes = []
+    nodeOffsets = arrays['nodeOffsets']
+    connectionOffsets = arrays['connectionOffsets']
+    for i in range(len(arrays['inNodes'])):
+        nodes = slice(int(nodeOffsets[i]), int(nodeOffsets[i+1]))
+        connections = slice(int(connectionOffsets[i]), int(connectionOffsets[i+1]))
+        gene = PackedGenome(
+            int(arrays['inNodes'][i]),
+            int(arrays['outNodes'][i]),
+            arrays['nodeIds'][nodes],
+            arrays['nodeTypes'][nodes],
+            arrays['nodeLayers'][nodes],
+            arrays['innovations'][connections],
+            arrays['inIds'][connections],
+            arrays['outIds'][connections],
+            arrays['weights'][connections],
+            arrays['enabled'][connections],
+            int(arrays['nextNode'][i]),
+            int(arrays['currLayer'][i]),
+            arrays['nodeActivations'][nodes]
+        )
+        gene.steps = arrays['steps'][i].item()
+        gene.fitness = arrays['fitness'][i].item()
+        genes.append(gene)
+
+    return genes
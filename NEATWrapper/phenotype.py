@@ -0,0 +1,352 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# Built-in libraries
+import copy
+import hashlib
+
+# Third-party libraries
+import numpy as np
+
+# Custom libraries
+from NEATWrapper.activations import ACTIVATIONS, ACTIVATION_NAMES
+
+class Phenotype:
+    """Phenotype - A compiled, array based version of a Genome used for fast forward passes.
+
+    The phenotype is built once from a genome (normally in Genome.generateNet). It stores the evaluation order of the network as one group of edges per layer, where each group holds contiguous arrays with the source index, target index and weight of every enabled connection leaving that layer. The values array holds the summed inputs of the nodes. When a group is propagated, the gathered values of its sources are activated, with one call per activation function, or a single call when the whole layer shares one, and the output values are activated the same way at the end. A forward pass is then a handful of NumPy operations per layer instead of one Python call per connection.
+
+    Args:
+        genome (Genome): The genome to compile.
+    """
+
+    def __init__(self, genome):
+        packed = genome.pack()
+
+        self.size = len(packed.nodeIds)
+        self.inNodes = packed.inNodes
+        self.outNodes = packed.outNodes
+        self.inputs = np.arange(packed.inNodes)
+        self.outputs = np.arange(packed.inNodes, packed.inNodes + packed.outNodes)
+
+        # * Map the node ids of the enabled connections to node indices.
+        sorter = np.argsort(packed.nodeIds)
+        enabled = np.flatnonzero(packed.enabled)
+        src = sorter[np.searchsorted(packed.nodeIds, packed.inIds[enabled], sorter=sorter)]
+        dst = sorter[np.searchsorted(packed.nodeIds, packed.outIds[enabled], sorter=sorter)]
+        weight = packed.weights[enabled]
+
+        # * Order the edges the way Genome.forward visits them: by the position of their source node in the network, then by connection order. Then split them into one group per source layer.
+        rank = np.empty(self.size, dtype=np.intp)
+        rank[np.argsort(packed.nodeLayers, kind='mergesort')] = np.arange(self.size)
+        order = np.lexsort((enabled, rank[src]))
+        src, dst, weight = src[order], dst[order], weight[order]
+
+        bounds = np.flatnonzero(np.diff(packed.nodeLayers[src])) + 1
+        self.layers = list(zip(np.split(src, bounds), np.split(dst, bounds), np.split(weight, bounds))) if len(src) else []
+
+        # * The activations index the gathered source values of a layer, not the nodes, so values itself is never written back to.
+        self.activations = [groupActivations(src, packed.nodeActivations) for src, _, _ in self.layers]
+        self.outputActivations = groupActivations(self.outputs, packed.nodeActivations)
+
+    def forward(self, _input):
+        """forward - Moves an input forward through the compiled network.
+
+        Args:
+            _input (list or np.ndarray): Observation of length inNodes.
+
+        Returns:
+            np.ndarray: The values of the output nodes.
+        """
+
+        # * The inputs and outputs are the first nodes, so they are sliced rather than indexed.
+        values = np.zeros(self.size)
+        values[:self.inNodes] = _input
+
+        for (src, dst, weight), activations in zip(self.layers, self.activations):
+            source = values[src]
+            if activations:
+                source = activate(source, activations)
+            values += np.bincount(dst, weights=source * weight, minlength=self.size)
+
+        return activate(values[self.inNodes:self.inNodes + self.outNodes], self.outputActivations)
+
+    def forwardBatch(self, _inputs):
+        """forwardBatch - Moves a batch of inputs forward through the compiled network at once.
+
+        Each row is evaluated exactly as forward would evaluate it on its own. The rows are kept apart by offsetting the target indices of every row by a multiple of the network size, so one bincount per layer covers the whole batch.
+
+        Args:
+            _inputs (np.ndarray): Observations of shape (N, inNodes).
+
+        Returns:
+            np.ndarray: The values of the output nodes, of shape (N, outNodes).
+        """
+
+        _inputs = np.asarray(_inputs, dtype=float)
+        rows = _inputs.shape[0]
+        offsets = np.arange(rows)[:, None] * self.size
+
+        values = np.zeros((rows, self.size))
+        values[:, :self.inNodes] = _inputs
+
+        for (src, dst, weight), activations in zip(self.layers, self.activations):
+            source = values[:, src]
+            if activations:
+                source = activate(source, activations)
+            values += np.bincount(
+                (offsets + dst).ravel(),
+                weights=(source * weight).ravel(),
+                minlength=rows * self.size
+            ).reshape(rows, self.size)
+
+        return activate(values[:, self.inNodes:self.inNodes + self.outNodes], self.outputActivations)
+
+    def getActionBatch(self, _inputs):
+        """getActionBatch - Finds the index of the largest output for every row in a batch of inputs.
+
+        Args:
+            _inputs (np.ndarray): Observations of shape (N, inNodes).
+
+        Returns:
+            np.ndarray: The chosen actions, of shape (N,).
+        """
+
+        return np.argmax(self.forwardBatch(_inputs), axis=1)
+
+    def getAction(self, _input):
+        """getAction - Finds the index of the largest output for the given input.
+
+        Args:
+            _input (list or np.ndarray): Observation of length inNodes.
+
+        Returns:
+            Int: The chosen action.
+        """
+
+        return int(np.argmax(self.forward(_input)))
+
+    def hash(self):
+        """hash - Digest of the compiled network.
+
+        Two phenotypes with the same digest compute the same outputs for every input, so it can be used to recognise genomes that were already evaluated.
+
+        Returns:
+            String: Hex digest of the node count, inputs, outputs, activations and every edge group.
+        """
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.array([self.size, len(self.layers)], dtype=np.int64).tobytes())
+        digest.update(self.inputs.astype(np.int64).tobytes())
+        digest.update(self.outputs.astype(np.int64).tobytes())
+        for (src, dst, weight), activations in zip(self.layers, self.activations):
+            digest.update(np.array([len(src)], dtype=np.int64).tobytes())
+            digest.update(src.astype(np.int64).tobytes())
+            digest.update(dst.astype(np.int64).tobytes())
+            digest.update(weight.tobytes())
+            hashActivations(digest, activations)
+        hashActivations(digest, self.outputActivations)
+
+        return digest.hexdigest()
+
+    def __repr__(self):
+        return "Phenotype: \n===> Nodes - {}, \n===> Layers - {}".format(
+            self.size,
+            len(self.layers)
+        )
+
+class PopulationPhenotype:
+    """PopulationPhenotype - The compiled phenotypes of a whole population packed into one set of arrays.
+
+    Every genome's network is placed in its own block of a single value vector, by offsetting its node indices with the sizes of the genomes before it. The k'th edge group of every genome is then concatenated into one packed group, so one sweep over the packed groups evaluates all the networks at the same time, each on its own observation.
+
+    Args:
+        genomes (list): List of Genome objects, all with the same number of input and output nodes.
+    """
+
+    def __init__(self, genomes):
+        phenotypes = []
+        for gene in genomes:
+            if gene.phenotype is None:
+                gene.phenotype = Phenotype(gene)
+            phenotypes.append(gene.phenotype)
+
+        self.genomes = len(phenotypes)
+        self.inNodes = phenotypes[0].inNodes
+        self.outNodes = phenotypes[0].outNodes
+
+        offsets = np.cumsum([0] + [p.size for p in phenotypes])
+        self.size = int(offsets[-1])
+        self.inputs = np.concatenate([p.inputs + offsets[i] for i, p in enumerate(phenotypes)])
+        self.outputs = np.concatenate([p.outputs + offsets[i] for i, p in enumerate(phenotypes)])
+
+        depth = max(len(p.layers) for p in phenotypes)
+        self.layers = []
+        self.activations = []
+        # * The genome every edge belongs to, per layer, see select.
+        self.owners = []
+        for k in range(depth):
+            src, dst, weight, activations, owners = [], [], [], [], []
+            for i, p in enumerate(phenotypes):
+                if k < len(p.layers):
+                    src.append(p.layers[k][0] + offsets[i])
+                    dst.append(p.layers[k][1] + offsets[i])
+                    weight.append(p.layers[k][2])
+                    activations.append((p.activations[k], len(p.layers[k][0])))
+                    owners.append(np.full(len(p.layers[k][0]), i, dtype=np.intp))
+            self.layers.append((np.concatenate(src), np.concatenate(dst), np.concatenate(weight)))
+            self.activations.append(mergeActivations(activations))
+            self.owners.append(np.concatenate(owners))
+        self.outputActivations = mergeActivations([(p.outputActivations, p.outNodes) for p in phenotypes])
+
+    def select(self, genomes):
+        """select - Packs a subset of the genomes, by masking the arrays of this one instead of merging their phenotypes again.
+
+        The selected genomes keep their blocks of the value vector, so the size is unchanged, but only their edges are swept.
+
+        Args:
+            genomes (list): Indices of the genomes to keep, in the order their observations and outputs are given in.
+
+        Returns:
+            PopulationPhenotype: The packed phenotype of the selected genomes.
+        """
+
+        genomes = np.asarray(genomes, dtype=np.intp)
+        alive = np.zeros(self.genomes, dtype=bool)
+        alive[genomes] = True
+
+        selected = copy.copy(self)
+        selected.genomes = len(genomes)
+        selected.inputs = self.inputs.reshape(self.genomes, self.inNodes)[genomes].ravel()
+        take = (genomes[:, None] * self.outNodes + np.arange(self.outNodes)).ravel()
+        selected.outputs = self.outputs[take]
+        selected.outputActivations = selectActivations(self.outputActivations, take, len(self.outputs))
+
+        selected.layers, selected.activations, selected.owners = [], [], []
+        for (src, dst, weight), activations, owners in zip(self.layers, self.activations, self.owners):
+            take = np.flatnonzero(alive[owners])
+            selected.layers.append((src[take], dst[take], weight[take]))
+            selected.activations.append(selectActivations(activations, take, len(src)))
+            selected.owners.append(owners[take])
+
+        return selected
+
+    def forward(self, _inputs):
+        """forward - Moves one observation per genome forward through all the networks.
+
+        Args:
+            _inputs (np.ndarray): Observations of shape (genomes, inNodes), row i belongs to genome i.
+
+        Returns:
+            np.ndarray: The values of the output nodes, of shape (genomes, outNodes).
+        """
+
+        values = np.zeros(self.size)
+        values[self.inputs] = np.asarray(_inputs, dtype=float).ravel()
+
+        for (src, dst, weight), activations in zip(self.layers, self.activations):
+            source = values[src]
+            if activations:
+                source = activate(source, activations)
+            values += np.bincount(dst, weights=source * weight, minlength=self.size)
+
+        return activate(values[self.outputs], self.outputActivations).reshape(self.genomes, self.outNodes)
+
+    def getActions(self, _inputs):
+        """getActions - Finds the action of every genome for its own observation.
+
+        Args:
+            _inputs (np.ndarray): Observations of shape (genomes, inNodes), row i belongs to genome i.
+
+        Returns:
+            np.ndarray: The chosen actions, of shape (genomes,).
+        """
+
+        return np.argmax(self.forward(_inputs), axis=1)
+
+    def __repr__(self):
+        return "PopulationPhenotype: \n===> Genomes - {}, \n===> Nodes - {}, \n===> Layers - {}".format(
+            self.genomes,
+            self.size,
+            len(self.layers)
+        )
+
+def groupActivations(nodes, nodeActivations):
+    """groupActivations - Groups the positions of a gathered slice of node values by their activation function.
+
+    Args:
+        nodes (np.ndarray): Node index of every position of the slice.
+        nodeActivations (np.ndarray): Activation of every node, as an index into ACTIVATION_NAMES.
+
+    Returns:
+        List: (name, positions) per activation function, leaving out identity as it does nothing. The positions are None if the whole slice shares the function.
+    """
+
+    activations = nodeActivations[nodes]
+    groups = [(ACTIVATION_NAMES[activation], np.flatnonzero(activations == activation)) for activation in np.unique(activations)]
+
+    return compactActivations(groups, len(nodes))
+
+def mergeActivations(groups):
+    """mergeActivations - Merges the activation groups of the slices of several networks concatenated into one.
+
+    Args:
+        groups (list): (activation groups, length of the slice) of every network, in the order they are concatenated.
+
+    Returns:
+        List: (name, positions) per activation function, see groupActivations.
+    """
+
+    merged = {}
+    offset = 0
+    for activations, length in groups:
+        for name, positions in activations:
+            merged.setdefault(name, []).append((np.arange(length) if positions is None else positions) + offset)
+        offset += length
+
+    return compactActivations([(name, np.concatenate(positions)) for name, positions in merged.items()], offset)
+
+def selectActivations(groups, take, length):
+    """
+    Get the activation groups of the slice values[take], from the groups of values, a slice of the given length
+    """
+    if len(groups) == 1 and groups[0][1] is None:
+        return groups
+
+    inverse = np.full(length, -1, dtype=np.intp)
+    inverse[take] = np.arange(len(take))
+    selected = []
+    for name, positions in groups:
+        positions = inverse[positions]
+        selected.append((name, positions[positions >= 0]))
+
+    return compactActivations(selected, len(take))
+
+def compactActivations(groups, length):
+    """
+    Drop the identity group, and replace the positions of a group covering the whole slice of the given length with None, so it is activated in one call without indexing
+    """
+    groups = [(name, positions) for name, positions in groups if name != 'identity']
+    if len(groups) == 1 and len(groups[0][1]) == length:
+        return [(groups[0][0], None)]
+
+    return groups
+
+def activate(values, groups):
+    """
+    Apply the activation functions of the groups to a gathered slice of node values, and return the activated slice. The slice may be changed in place, so only pass a copy such as values[src]. The positions index the last axis, so the slice can hold one network or a batch of them
+    """
+    for name, positions in groups:
+        if positions is None:
+            return ACTIVATIONS[name](values)
+        values[..., positions] = ACTIVATIONS[name](values[..., positions])
+
+    return values
+
+def hashActivations(digest, groups):
+    for name, positions in groups:
+        digest.update(name.encode())
+        digest.update(b'all' if positions is None else positions.astype(np.int64).tobytes())
@@ -5,29 +5,48 @@
 # ================================
 
 # Built-in libraries
+import random
+import weakref
+from concurrent.futures import ProcessPoolExecutor
 from math import inf
 
 # Custom libraries
 from NEATWrapper.genome import Genome
-from NEATWrapper.species import Species
 from NEATWrapper.innovation import Innovation
+from NEATWrapper.species import Species
+from NEATWrapper.phenotype import PopulationPhenotype
+from NEATWrapper.profiling import Profiler
+from NEATWrapper import speciation
 
 class Population:
     """
     Class for NEAT Algorithm 
+    @param pop_size: int, size of the population
+    @param _inSize: int, number of input nodes of every gene
+    @param _outSize: int, number of output nodes of every gene
+    @param profile: bool, whether or not to time and count the phases of naturalSelection. The report of the last generation is kept in self.report. Optional, defaults to False
+    @param pruneInnovations: int, evict innovation history entries that have not been in any living genome for this many generations, see Innovation.prune. Optional, defaults to None (keep the whole history)
+    @param workers: int, number of processes the offspring are bred in, see reproduceJobs. 1 breeds them in this process the same way, and gives the same population for the same seed. The worker processes are shut down by close, or when the population is garbage collected. Optional, defaults to None (breed them serially, sharing the innovation history)
+    @param packed: bool, whether or not to keep the genes as PackedGenome objects between generations. They are evaluated, speciated and kept as champions packed, and only the parents are unpacked while their species breeds, see breed. Evolves the same population as the unpacked mode for the same seed. Optional, defaults to False
     """
 
-    def __init__(self, pop_size, _inSize, _outSize):
+    def __init__(self, pop_size, _inSize, _outSize, profile=False, workers=None, pruneInnovations=None, packed=False):
         self.pop_size = pop_size
         self.population = []
         self.species = []
-        self.innovationHistory = Innovation()
+        self.innovationHistory = Innovation(pruneAfter=pruneInnovations)
         self.bestScore = -inf
         self.bestGene = None
+        self.phenotype = None
+        self.profiler = Profiler(enabled=profile)
+        self.report = None
+        self.workers = workers
+        self.executor = None
+        self.packed = packed
 
         for _ in range(self.pop_size):
             gene = Genome(_inSize, _outSize, self.innovationHistory)
-            self.population.append(gene)
+            self.population.append(gene.pack() if packed else gene)
 
     def getGene(self, i):
         return self.population[i]
@@ -35,30 +54,158 @@ class Population:
     def size(self):
         return self.pop_size
 
+    def getActions(self, observations):
+        """
+        Get the action of every gene in the population in one vectorized pass. Row i of observations, of shape (pop_size, inNodes), is the input for gene i
+        """
+        if self.phenotype is None:
+            self.phenotype = PopulationPhenotype(self.population)
+
+        return self.phenotype.getActions(observations)
+
+    def evaluate(self, scheduler):
+        """
+        Evaluate every gene in the population with an AsyncScheduler (or anything else with run(genes) -> rewards), and store the rewards as the steps of the genes. Returns the rewards in population order
+        """
+        steps = scheduler.run(self.population)
+        for gene, r in zip(self.population, steps):
+            gene.steps = r
+
+        return steps
+
     def naturalSelection(self):
-        self.calcFitness()
-        self.speciate()
-        self.sortSpecies()
-        self.cullSpecies()
-        self.findBestGene()
-        self.killStaleSpecies()
-        self.killBadSpecies()
+        profiler = self.profiler
+        profiler.reset()
+        clones = Genome.cloneCount
+        innovations = self.innovationHistory.innoNo
 
-        self.population = []
+        with profiler.phase('calcFitness'):
+            self.calcFitness()
+        with profiler.phase('speciate'):
+            self.speciate()
+        with profiler.phase('sortSpecies'):
+            self.sortSpecies()
+        with profiler.phase('cullSpecies'):
+            self.cullSpecies()
+        with profiler.phase('findBestGene'):
+            self.findBestGene()
+        with profiler.phase('killStaleSpecies'):
+            self.killStaleSpecies()
+        with profiler.phase('killBadSpecies'):
+            self.killBadSpecies()
+
+        with profiler.phase('reproduction'):
+            if self.workers:
+                self.population = self.reproduceJobs()
+            else:
+                self.population = self.reproduce()
+
+        with profiler.phase('generateNet'):
+            # * The networks are kept up to date by the mutations, so only the changed genes need their phenotype compiled.
+            for gene in self.population:
+                gene.getPhenotype()
+            self.phenotype = None
+
+        if self.innovationHistory.pruneAfter is not None:
+            with profiler.phase('pruneInnovations'):
+                living = self.population + [s.champ for s in self.species]
+                if self.bestGene is not None:
+                    living.append(self.bestGene)
+                profiler.count('prunedInnovations', self.innovationHistory.prune(living))
+
+        if profiler.enabled:
+            profiler.count('species', len(self.species))
+            profiler.count('clones', Genome.cloneCount - clones)
+            profiler.count('newInnovations', self.innovationHistory.innoNo - innovations)
+            self.report = profiler.report()
+
+    def reproduce(self):
+        """
+        Breed the next generation serially: the champion of every species plus its share of children, filled up with children of the best species
+        """
+        population = []
         avgSum = self.getAvgFitnessSum()
         for s in self.species:
-            self.population.append(s.champ.clone())
+            population.append(s.champ.clone())
             noOfChild = int(s.avgFitness / avgSum * self.size()) - 1
-            for _ in range(noOfChild):
-                self.population.append(s.reproduce(self.innovationHistory))
+            population.extend(self.breed(s, noOfChild))
 
-        while len(self.population) < self.size():
-            self.population.append(self.species[0].reproduce(self.innovationHistory))
+        population.extend(self.breed(self.species[0], self.size() - len(population)))
 
-        for gene in self.population:
-            gene.generateNet()
+        return population
+
+    def breed(self, species, count):
+        """
+        Breed count children of a species with the shared innovation history. In packed mode the members are unpacked for the breeding only, and the children are packed
+        """
+        if count <= 0:
+            return []
+
+        if not self.packed:
+            return [species.reproduce(self.innovationHistory) for _ in range(count)]
+
+        members = species.members
+        species.members = [member.unpack() for member in members]
+        try:
+            return [species.reproduce(self.innovationHistory).pack() for _ in range(count)]
+        finally:
+            species.members = members
 
-        print(f'Number of innovations: {self.innovationHistory.size()}')
+    def reproduceJobs(self):
+        """
+        Breed the next generation as one job per species, run across self.workers processes (or in this process if it is 1).
+        Every job gets the packed members of its species and a seed drawn from the random module, breeds its children against a throwaway innovation history and returns them packed.
+        The children are then renumbered with the real history in job order, see Innovation.reconcile, so the same (in, out) pair gets the same number in every job, and the population only depends on the seed, not on the number of workers
+        """
+        avgSum = self.getAvgFitnessSum()
+        counts = [int(s.avgFitness / avgSum * self.size()) - 1 for s in self.species]
+        fill = self.size() - len(self.species) - sum(max(n, 0) for n in counts)
+
+        # * A species without children only contributes its champion, so it gets no job. None marks the fill up job.
+        owners = [i for i, n in enumerate(counts) if n > 0]
+        jobs = [(random.getrandbits(32), [m.pack() for m in self.species[i].members], counts[i]) for i in owners]
+        if fill > 0:
+            owners.append(None)
+            jobs.append((random.getrandbits(32), [m.pack() for m in self.species[0].members], fill))
+
+        if self.workers > 1:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers)
+                # * Shut the workers down if the population is dropped without close.
+                weakref.finalize(self, self.executor.shutdown, wait=False)
+            results = list(self.executor.map(_reproduce, jobs))
+        else:
+            # * The jobs seed the random module, so put its state back for the rest of the generation.
+            state = random.getstate()
+            try:
+                results = [_reproduce(job) for job in jobs]
+            finally:
+                random.setstate(state)
+
+        # * Reconcile in job order, the order the jobs were seeded in.
+        children = {owner: [self.fromPacked(self.innovationHistory.reconcile(child)) for child in packed] for owner, packed in zip(owners, results)}
+
+        population = []
+        for i, s in enumerate(self.species):
+            population.append(s.champ.clone())
+            population.extend(children.get(i, []))
+        population.extend(children.get(None, []))
+
+        return population
+
+    def fromPacked(self, child):
+        """
+        Get a PackedGenome in the form the population keeps its genes in
+        """
+        return child if self.packed else child.unpack()
+
+    def close(self):
+        """
+        Shut down the worker processes, if any were started
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
 
     def findBestGene(self):
         gensBestGene = self.species[0].members[0]
@@ -85,18 +232,8 @@ class Population:
             gene.fitness = gene.steps**2 / sums
         
     def speciate(self):
-        for s in self.species:
-            s.clear()
-        
-        for gene in self.population:
-            gotSpecies = False
-            for s in self.species:
-                if s.compare(gene):
-                    s.addToSpecies(gene)
-                    gotSpecies = True
-                    break
-            if not gotSpecies:
-                self.species.append(Species(gene))
+        comparisons = speciation.speciate(self.population, self.species)
+        self.profiler.count('comparisons', comparisons)
 
     def killStaleSpecies(self):
         self.species[:] = [s for s in self.species if s.staleness < 15]
@@ -125,5 +262,19 @@ class Population:
         self.bestGene = None
         self.bestScore = -inf
 
+def _reproduce(job):
+    """
+    Breed the children of one species in a reproduction job of Population.reproduceJobs. Returns the children packed, numbered against a throwaway innovation history
+    """
+    seed, members, count = job
+    random.seed(seed)
+    members = [member.unpack() for member in members]
+
+    species = Species(members[0])
+    species.members = members
+    innovation = Innovation()
+
+    return [species.reproduce(innovation).pack() for _ in range(count)]
+
 if __name__ == '__main__':
     neat = Population(1, 2, 2)
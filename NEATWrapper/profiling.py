@@ -0,0 +1,127 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# Built-in libraries
+import time
+
+class _NullPhase:
+    """
+    Context manager that does nothing, returned by a disabled Profiler
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+_NULL_PHASE = _NullPhase()
+
+class _Phase:
+    """
+    Context manager adding the time spent inside it to a phase of a Profiler
+    """
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        timings = self.profiler.timings
+        timings[self.name] = timings.get(self.name, 0) + time.perf_counter() - self.start
+        return False
+
+class Profiler:
+    """Profiler - Timers and counters for the phases of a generation.
+
+    Used by Population.naturalSelection to time every phase and count the work done in it. When it is disabled, phase returns a shared no-op context manager and count returns straight away, so the instrumentation costs nothing measurable.
+
+    Args:
+        enabled (bool, optional): Defaults to True. Whether or not to record anything.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.timings = {}
+        self.counters = {}
+
+    def reset(self):
+        """reset - Clears all timings and counters.
+        """
+
+        self.timings = {}
+        self.counters = {}
+
+    def phase(self, name):
+        """phase - Times the code inside a with block as the given phase.
+
+        Args:
+            name (String): Name of the phase.
+
+        Returns:
+            Context manager.
+        """
+
+        if not self.enabled:
+            return _NULL_PHASE
+
+        return _Phase(self, name)
+
+    def count(self, name, n=1):
+        """count - Adds n to the given counter.
+
+        Args:
+            name (String): Name of the counter.
+            n (Int, optional): Defaults to 1. The amount to add.
+        """
+
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def report(self):
+        """report - Gets the timings and counters recorded so far.
+
+        Returns:
+            ProfileReport: The report.
+        """
+
+        return ProfileReport(dict(self.timings), dict(self.counters))
+
+class ProfileReport:
+    """ProfileReport - The timings and counters of one generation.
+
+    Args:
+        timings (dict): Phase name -> seconds spent in it.
+        counters (dict): Counter name -> value.
+    """
+
+    def __init__(self, timings, counters):
+        self.timings = timings
+        self.counters = counters
+
+    def total(self):
+        """total - Total time spent in all phases.
+
+        Returns:
+            Float: The time in seconds.
+        """
+
+        return sum(self.timings.values())
+
+    def toDict(self):
+        return {'timings': dict(self.timings), 'counters': dict(self.counters)}
+
+    def __repr__(self):
+        total = self.total() or 1
+        lines = ['Profile Report:']
+        for name, seconds in sorted(self.timings.items(), key=lambda x: x[1], reverse=True):
+            lines.append(f'===> {name:18} {seconds*1000:10.3f} ms {seconds/total*100:6.1f} %')
+        for name, value in sorted(self.counters.items()):
+            lines.append(f'===> {name:18} {value:10}')
+
+        return '\n'.join(lines)
@@ -0,0 +1,69 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# Third-party libraries
+import numpy as np
+
+# * Number of episodes a gene needs before equal rewards are trusted to mean zero variance.
+MIN_CERTAIN_EPISODES = 3
+
+def race(evaluate, count, episodes, minEpisodes=2, quantile=0.5, z=2.0, groups=None):
+    """race - Multi episode evaluation that spends its episodes on the genes whose rank is still uncertain.
+
+    Every gene first gets minEpisodes episodes. Natural selection culls every species to its best half (see Species.cull), so after each round the selection cutoff of a gene is the given quantile of the mean rewards in its group, e.g. the species it was assigned to (see speciation.assignSpecies). Groups of fewer than 3 genes are not culled, so their genes are safe. A gene stays in the race only while the cutoff lies within z standard errors of its mean: genes clearly below are hopeless and genes clearly above are safe, so neither needs more episodes. A gene whose rewards are all equal is only taken to have zero variance after MIN_CERTAIN_EPISODES episodes. The genes still racing get their number of episodes doubled, up to episodes, in the next round. In deterministic environments the race ends once every gene has MIN_CERTAIN_EPISODES episodes.
+
+    Args:
+        evaluate (function): Takes a list of gene indices (an index can repeat) and returns one episode reward per entry.
+        count (Int): Number of genes.
+        episodes (Int): Maximum number of episodes per gene.
+        minEpisodes (Int, optional): Defaults to 2. Number of episodes every gene gets.
+        quantile (Float, optional): Defaults to 0.5. Quantile of the mean rewards used as the selection cutoff.
+        z (Float, optional): Defaults to 2.0. Width of the confidence interval in standard errors.
+        groups (list, optional): Defaults to None (one group). The group of every gene, the genes of a group compete for the same cutoff.
+
+    Returns:
+        Tuple: The mean reward of every gene and the total number of episodes run.
+    """
+
+    if groups is None:
+        groups = [0] * count
+    members = {}
+    for i, group in enumerate(groups):
+        members.setdefault(group, []).append(i)
+
+    rewards = [[] for _ in range(count)]
+    racing = list(range(count))
+    target = min(minEpisodes, episodes)
+    total = 0
+
+    while racing:
+        jobs = [i for i in racing for _ in range(target - len(rewards[i]))]
+        for i, r in zip(jobs, evaluate(jobs)):
+            rewards[i].append(r)
+        total += len(jobs)
+
+        if target >= episodes:
+            break
+
+        means = np.array([np.mean(r) for r in rewards])
+        cutoffs = {group: np.quantile(means[genes], quantile) for group, genes in members.items() if len(genes) > 2}
+        stillRacing = []
+        for i in racing:
+            if groups[i] not in cutoffs:
+                continue
+
+            n = len(rewards[i])
+            std = np.std(rewards[i], ddof=1) if n > 1 else np.inf
+            if std == 0 and n < MIN_CERTAIN_EPISODES:
+                std = np.inf
+            error = z * std / np.sqrt(n)
+            if means[i] - error <= cutoffs[groups[i]] <= means[i] + error:
+                stillRacing.append(i)
+
+        racing = stillRacing
+        target = min(target * 2, episodes)
+
+    return [float(np.mean(r)) for r in rewards], total
@@ -0,0 +1,152 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+"""
+Asynchronous evaluation of genes, for fitness functions that live outside this process.
+
+An evaluator is any object with a coroutine method
+
+    async def evaluate(self, gene): -> reward
+
+and AsyncScheduler runs it for a whole population with a bounded number of episodes in flight.
+"""
+
+# Built-in libraries
+import asyncio
+import contextlib
+import json
+
+class AsyncScheduler:
+    """AsyncScheduler - Runs an async evaluator over many genes, with up to concurrency episodes in flight.
+
+    A new episode is only started once a slot is free, so at most concurrency evaluations (and connections to the simulator) exist at a time, however large the population is. Episodes that take longer than timeout seconds are cancelled and get timeoutReward. If an episode raises, no more episodes are started, the ones in flight are cancelled and the exception is raised.
+
+    Args:
+        evaluator: Object with an async evaluate(gene) method returning the reward of one episode.
+        concurrency (Int, optional): Defaults to 8. Maximum number of episodes in flight.
+        timeout (Float, optional): Defaults to None. Seconds an episode may take, None for no limit.
+        timeoutReward (Float, optional): Defaults to 0. Reward of an episode that timed out.
+    """
+
+    def __init__(self, evaluator, concurrency=8, timeout=None, timeoutReward=0):
+        self.evaluator = evaluator
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.timeoutReward = timeoutReward
+        self.timeouts = 0
+
+    async def evaluateAll(self, genes):
+        """evaluateAll - Evaluates every gene, keeping at most concurrency episodes in flight.
+
+        Args:
+            genes (list): The genes to evaluate.
+
+        Returns:
+            list: The reward of every gene, in the order of the list.
+        """
+
+        slots = asyncio.Semaphore(self.concurrency)
+        failed = []
+        tasks = []
+        try:
+            for gene in genes:
+                # * Backpressure: wait for a free slot before the next episode is even created.
+                await slots.acquire()
+                if failed:
+                    # * An episode raised, so start no more. gather raises its exception.
+                    break
+                tasks.append(asyncio.ensure_future(self._evaluate(gene, slots, failed)))
+
+            return list(await asyncio.gather(*tasks))
+        finally:
+            # * After a failure, wait for the cancelled episodes, so they close their connections before the event loop is closed.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _evaluate(self, gene, slots, failed):
+        try:
+            return await asyncio.wait_for(self.evaluator.evaluate(gene), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            return self.timeoutReward
+        except Exception:
+            failed.append(gene)
+            raise
+        finally:
+            slots.release()
+
+    def run(self, genes):
+        """run - Evaluates every gene from synchronous code, on an event loop of its own.
+
+        Args:
+            genes (list): The genes to evaluate.
+
+        Returns:
+            list: The reward of every gene, in the order of the list.
+        """
+
+        loop = asyncio.new_event_loop()
+        try:
+            asyncio.set_event_loop(loop)
+            return loop.run_until_complete(self.evaluateAll(genes))
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+class SocketEvaluator:
+    """SocketEvaluator - Evaluates genes against an external simulator over a TCP socket.
+
+    Every episode opens its own connection, so one simulator server can run many episodes at a time. Messages are JSON objects, one per line. The evaluator sends {"reset": true}, and then one {"action": a} per step. The simulator answers the reset with {"obs": [...]} and every action with {"obs": [...], "reward": r, "done": d}. The episode ends when the simulator says done, or after maxSteps steps.
+
+    Args:
+        host (String): Host of the simulator.
+        port (Int): Port of the simulator.
+        maxSteps (Int, optional): Defaults to 1000. Maximum number of steps per episode.
+    """
+
+    def __init__(self, host, port, maxSteps=1000):
+        self.host = host
+        self.port = port
+        self.maxSteps = maxSteps
+
+    async def evaluate(self, gene):
+        """evaluate - Runs one episode of a gene on the simulator.
+
+        Args:
+            gene (Genome): The gene, or anything else with getAction.
+
+        Returns:
+            Float: The total reward of the episode.
+        """
+
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            obs = (await self.request(reader, writer, {'reset': True}))['obs']
+            r = 0
+            for _ in range(self.maxSteps):
+                answer = await self.request(reader, writer, {'action': int(gene.getAction(obs))})
+                obs = answer['obs']
+                r += answer['reward']
+                if answer['done']:
+                    break
+
+            return r
+        finally:
+            writer.close()
+            # * wait_closed is new in Python 3.7. A connection the simulator already reset is closed either way.
+            if hasattr(writer, 'wait_closed'):
+                with contextlib.suppress(ConnectionError):
+                    await writer.wait_closed()
+
+    async def request(self, reader, writer, message):
+        writer.write((json.dumps(message) + '\n').encode())
+        await writer.drain()
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError(f'Simulator at {self.host}:{self.port} closed the connection')
+
+        return json.loads(line.decode())
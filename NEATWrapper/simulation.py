@@ -6,59 +6,291 @@
 
 # Built-in libraries
 import sys
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
 
 # Third-party libraries
-import gym
+import numpy as np
 
 # Custom libraries
 from NEATWrapper.population import Population
+from NEATWrapper.phenotype import PopulationPhenotype
+from NEATWrapper.checkpoint import saveCheckpoint, loadCheckpoint
+from NEATWrapper.metrics import generationRecord, genomeRecord
+from NEATWrapper.racing import race
+from NEATWrapper.speciation import assignSpecies
 
 class Simulation:
     """
     Class for doing a simulation using the NEAT Algorithm
     @param env: string, gym environment name
     @param pop_size: int, size of the population
-    @param verbosity: int, the level of verbosity [1, 2]. 1 is the lowest level and 2 is the highest level. Optional, defaults to 1
+    @param verbosity: int, the level of verbosity [0, 1, 2]. 0 prints nothing, 1 prints a throttled progress line and a summary per generation, and 2 also prints the reward of every gene. Optional, defaults to 1
+    @param workers: int, number of worker processes used to evaluate the genes, each with its own environment. The worker processes are shut down by close, or when the simulation is garbage collected. Optional, defaults to None (evaluate in this process)
+    @param envs: int, number of environments stepped in lockstep when evaluating the genes in this process. Optional, defaults to None (one gene at a time)
+    @param sinks: list, callables that get one metrics record (a dict) per generation, e.g. a JSONLSink. Optional, defaults to None
+    @param genomeMetrics: bool, whether or not to also send one record per evaluated gene to the sinks. Optional, defaults to False
+    @param progressInterval: float, minimum number of seconds between two progress lines. Optional, defaults to 1
+    @param cache: FitnessCache, cache of rewards by phenotype, used to skip genes whose phenotype was already evaluated. Only valid for deterministic environments. Optional, defaults to None
+    @param seed: int, seed the environment gets before every episode, to make its episodes repeatable. Optional, defaults to None
+    @param episodes: int, maximum number of episodes per gene. With more than one, the genes are raced (see NEATWrapper.racing) and their fitness is the mean reward. Only useful for stochastic environments, so leave seed unset. Optional, defaults to 1
+    @param minEpisodes: int, number of episodes every gene gets before the race drops the hopeless and the safe ones. Optional, defaults to 2
+    @param quantile: float, quantile of the mean rewards of a species the race takes as its selection cutoff. Optional, defaults to 0.5 (the half Species.cull keeps)
+    @param z: float, number of standard errors the mean reward of a gene must be away from its cutoff before the race drops it. Optional, defaults to 2
+    @param packed: bool, whether or not the population keeps its genes packed between generations, see Population. Optional, defaults to False
     """
-    def __init__(self, env, pop_size, verbosity=1):
-        self.env = gym.make(env)
+    def __init__(self, env, pop_size, verbosity=1, workers=None, envs=None, sinks=None, genomeMetrics=False, progressInterval=1, cache=None, seed=None, episodes=1, minEpisodes=2, quantile=0.5, z=2.0, packed=False):
+        self.envName = env
+        self.env = makeEnv(env)
+        self.envs = [self.env] + [makeEnv(env) for _ in range(envs - 1)] if envs else [self.env]
         self._maxSteps = self.env._max_episode_steps
-        self.pop = Population(pop_size, self.env.observation_space.shape[0], self.env.action_space.n)
+        self.pop = Population(pop_size, self.env.observation_space.shape[0], self.env.action_space.n, packed=packed)
         self.verbosity = verbosity
+        self.workers = workers
+        self.executor = None
+        self.sinks = sinks or []
+        self.genomeMetrics = genomeMetrics
+        self.progressInterval = progressInterval
+        self.lastProgress = 0
+        self.cache = cache
+        self.seed = seed
+        self.episodes = episodes
+        self.minEpisodes = minEpisodes
+        self.quantile = quantile
+        self.z = z
+        self.episodesRun = 0
         self.currGen = 1
 
-    def run(self, generations, render=False, graph=True):
+    def run(self, generations, render=False, graph=True, checkpoint=None):
         """
-        Function for running X number of generations of the simulation. 
+        Function for running X number of generations of the simulation. If checkpoint is a path, the simulation is checkpointed there after every generation.
         """
         for _ in range(generations):
-            steps = []
-            for i in range(self.pop.size()):
-                obs = self.env.reset()
-                gene = self.pop.getGene(i)
-                r = 0
-                for _ in range(self._maxSteps):
-                    if render:
-                        self.env.render()
-                    action = gene.getAction(obs)
-                    obs, reward, done, _ = self.env.step(action)
-                    r += reward
-                    sys.stdout.write(f'\rGene {i+1}) no. steps {r} ')
-                    sys.stdout.flush()
-                    if done:
-                        if self.verbosity == 2:
-                            print(f'Gene {i+1}) reward {r}')
-                        gene.steps = r
-                        steps.append(r)
-                        r = 0
-                        break
-            print(f'\nGeneration Max Reward: {max(steps)}')
-            print(f'Generation Min Reward: {min(steps)}')
+            start = time.perf_counter()
+            steps = self.evaluatePopulation(render)
+            evaluated = time.perf_counter()
+
+            if self.verbosity:
+                print(f'\nGeneration Max Reward: {max(steps)}')
+                print(f'Generation Min Reward: {min(steps)}')
             if graph:
                 self.pop.getGene(steps.index(max(steps))).drawGenome()
+
+            genes = list(self.pop.population)
             self.pop.naturalSelection()
-            print(f'=============== Finished generation {self.currGen} ===============')
+            selected = time.perf_counter()
+
+            if self.sinks:
+                self.emitMetrics(steps, genes, {
+                    'evaluate': evaluated - start,
+                    'naturalSelection': selected - evaluated
+                })
+
+            if self.verbosity:
+                print(f'=============== Finished generation {self.currGen} ===============')
             self.currGen += 1
+            if checkpoint:
+                self.saveCheckpoint(checkpoint)
+
+    def emitMetrics(self, steps, genes, timings):
+        """
+        Sends the metrics record of the generation that was just evaluated, and optionally one record per gene, to every sink
+        """
+        if self.genomeMetrics:
+            for i, (r, gene) in enumerate(zip(steps, genes)):
+                record = genomeRecord(self.currGen, i, r, gene)
+                for sink in self.sinks:
+                    sink(record)
+
+        record = generationRecord(self.currGen, steps, genes)
+        record['species'] = len(self.pop.species)
+        record['innovations'] = self.pop.innovationHistory.size()
+        record['innovationBytes'] = self.pop.innovationHistory.memoryFootprint()['bytes']
+        record['bestScore'] = self.pop.getBestScore()
+        record['timings'] = timings
+        if self.pop.report is not None:
+            record['phases'] = self.pop.report.toDict()
+        if self.cache is not None:
+            record['cache'] = self.cache.stats()
+        if self.episodes > 1:
+            record['episodes'] = self.episodesRun
+        for sink in self.sinks:
+            sink(record)
+
+    def progress(self, message):
+        """
+        Writes a progress line, at most once every progressInterval seconds
+        """
+        now = time.perf_counter()
+        if self.verbosity and now - self.lastProgress >= self.progressInterval:
+            self.lastProgress = now
+            sys.stdout.write(f'\r{message} ')
+            sys.stdout.flush()
+
+    def saveCheckpoint(self, path):
+        """
+        Saves the population and the current generation to a checkpoint directory, see NEATWrapper.checkpoint
+        """
+        saveCheckpoint(self.pop, path, currGen=self.currGen)
+
+    def loadCheckpoint(self, path):
+        """
+        Restores the population and the current generation from a checkpoint directory, so run continues where the checkpointed run stopped
+        """
+        self.pop.close()
+        self.pop, extra = loadCheckpoint(path)
+        self.currGen = extra.get('currGen', 1)
+
+    def evaluatePopulation(self, render=False):
+        """
+        Function for evaluating every gene in the population. Genes found in the fitness cache get their cached reward, the rest are evaluated with the configured evaluation mode. Returns the rewards in population order.
+        """
+        genes = list(self.pop.population)
+        if self.cache is None:
+            return self.evaluateEpisodes(genes, render)
+
+        keys = [(gene.getPhenotype().hash(), self.seed) for gene in genes]
+        steps = [self.cache.get(key) for key in keys]
+        missing = [i for i, r in enumerate(steps) if r is None]
+
+        rewards = self.evaluateEpisodes([genes[i] for i in missing], render)
+        for i, r in zip(missing, rewards):
+            steps[i] = r
+            self.cache.put(keys[i], r)
+
+        for gene, r in zip(genes, steps):
+            gene.steps = r
+
+        return steps
+
+    def evaluateEpisodes(self, genes, render=False):
+        """
+        Function for getting the fitness of the genes in the given list. With one episode per gene this is evaluateGenes, otherwise the genes are raced over up to self.episodes episodes and get their mean reward. Every gene is raced against the genes of the species of the last generation it belongs to, as that is where it is selected. Returns the rewards in the order of the list.
+        """
+        if self.episodes <= 1:
+            steps = self.evaluateGenes(genes, render)
+            self.episodesRun = len(genes)
+            return steps
+
+        steps, self.episodesRun = race(
+            lambda jobs: self.evaluateGenes([genes[i] for i in jobs], render),
+            len(genes),
+            self.episodes,
+            minEpisodes=self.minEpisodes,
+            quantile=self.quantile,
+            z=self.z,
+            groups=assignSpecies(genes, self.pop.species)
+        )
+        for gene, r in zip(genes, steps):
+            gene.steps = r
+
+        return steps
+
+    def evaluateGenes(self, genes, render=False):
+        """
+        Function for running one episode per gene in the given list, with worker processes, lockstep environments or one at a time, depending on how the simulation was set up. Returns the rewards in the order of the list.
+        """
+        if self.workers and not render:
+            return self.evaluateParallel(genes)
+        if len(self.envs) > 1 and not render:
+            return self.evaluateVectorized(genes)
+
+        return self.evaluate(genes, render)
+
+    def evaluate(self, genes=None, render=False):
+        """
+        Function for running one episode per gene, one gene at a time, in this process. Evaluates the whole population if genes is None. Returns the rewards in the order of the genes.
+        """
+        if genes is None:
+            genes = list(self.pop.population)
+
+        steps = []
+        for i, gene in enumerate(genes):
+            r = runEpisode(self.env, gene, self._maxSteps, seed=self.seed, render=render)
+            if self.verbosity == 2:
+                print(f'Gene {i+1}) reward {r}')
+            gene.steps = r
+            steps.append(r)
+            self.progress(f'Gene {i+1}/{len(genes)}')
+
+        return steps
+
+    def evaluateVectorized(self, genes=None):
+        """
+        Function for running one episode per gene, stepping len(self.envs) environments in lockstep. The observations of the running episodes are stacked and fed to one packed forward pass of their genes. When an episode finishes, its environment is given the next unevaluated gene straight away, and only the running episodes are stepped and computed. The genes are packed once, and the running ones are selected from that, see PopulationPhenotype.select. Evaluates the whole population if genes is None. Returns the rewards in the order of the genes.
+        """
+        if genes is None:
+            genes = list(self.pop.population)
+
+        steps = [0] * len(genes)
+        slots = [None] * len(self.envs)
+        episodeSteps = [0] * len(self.envs)
+        obs = np.zeros((len(self.envs), self.env.observation_space.shape[0]))
+        nextGene = 0
+        packed = PopulationPhenotype(genes) if genes else None
+        phenotype = None
+        while True:
+            # * Refill the free environments with the next genes.
+            for j, env in enumerate(self.envs):
+                if slots[j] is None and nextGene < len(genes):
+                    slots[j] = nextGene
+                    obs[j] = resetEnv(env, self.seed)
+                    episodeSteps[j] = 0
+                    nextGene += 1
+                    phenotype = None
+
+            active = [j for j, i in enumerate(slots) if i is not None]
+            if not active:
+                break
+
+            # * The running genes only change when an episode ends or starts.
+            if phenotype is None:
+                phenotype = packed.select([slots[j] for j in active])
+
+            actions = phenotype.getActions(obs[active])
+            for j, action in zip(active, actions):
+                i = slots[j]
+                obs[j], reward, done, _ = self.envs[j].step(int(action))
+                steps[i] += reward
+                episodeSteps[j] += 1
+                if done or episodeSteps[j] >= self._maxSteps:
+                    if self.verbosity == 2:
+                        print(f'Gene {i+1}) reward {steps[i]}')
+                    genes[i].steps = steps[i]
+                    slots[j] = None
+                    phenotype = None
+
+        return steps
+
+    def evaluateParallel(self, genes=None):
+        """
+        Function for running one episode per gene across the worker processes. Genes are shipped as their compiled phenotypes, and the rewards are written back to the genes in order. Evaluates the whole population if genes is None. Returns the rewards in the order of the genes.
+        """
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            # * Shut the workers down if the simulation is dropped without close.
+            weakref.finalize(self, self.executor.shutdown, wait=False)
+
+        if genes is None:
+            genes = list(self.pop.population)
+
+        jobs = [(self.envName, gene.getPhenotype(), self.seed) for gene in genes]
+        chunksize = max(1, len(jobs) // (self.workers * 4))
+        steps = list(self.executor.map(_runEpisode, jobs, chunksize=chunksize))
+        for gene, r in zip(genes, steps):
+            gene.steps = r
+
+        return steps
+
+    def close(self):
+        """
+        Shuts down the worker processes of the evaluation and of the population, if any were started
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        self.pop.close()
 
     def runBest(self):
         obs = self.env.reset()
@@ -79,3 +311,50 @@ class Simulation:
         if r < score:
             self.pop.clearBest()
         gene.drawGenome()
+
+
+def resetEnv(env, seed=None):
+    """
+    Resets an environment, seeding it first if a seed is given
+    """
+    if seed is not None:
+        env.seed(seed)
+    return env.reset()
+
+def runEpisode(env, policy, maxSteps, seed=None, render=False):
+    """
+    Runs one episode with a policy (anything with getAction, e.g. a Genome or a Phenotype) and returns the total reward
+    """
+    obs = resetEnv(env, seed)
+    r = 0
+    for _ in range(maxSteps):
+        if render:
+            env.render()
+        action = policy.getAction(obs)
+        obs, reward, done, _ = env.step(action)
+        r += reward
+        if done:
+            break
+
+    return r
+
+def makeEnv(name):
+    """
+    Creates a gym environment. gym is imported here, the first time an environment is needed, so that importing NEATWrapper does not pull it in.
+    """
+    import gym
+    return gym.make(name)
+
+# * Environments owned by this (worker) process, one per environment name.
+_envs = {}
+
+def _runEpisode(job):
+    """
+    Runs one episode of a compiled phenotype in this process' own environment and returns the total reward. Used by the worker processes of Simulation.evaluateParallel.
+    """
+    envName, phenotype, seed = job
+    if envName not in _envs:
+        _envs[envName] = makeEnv(envName)
+    env = _envs[envName]
+
+    return runEpisode(env, phenotype, env._max_episode_steps, seed=seed)
@@ -0,0 +1,156 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# Third-party libraries
+import numpy as np
+
+# Custom libraries
+from NEATWrapper.species import Species
+
+def flattenGenes(genes):
+    """flattenGenes - Encodes a list of genomes as one sparse innovation -> weight table.
+
+    Args:
+        genes (list): List of Genome objects.
+
+    Returns:
+        Tuple: Arrays with the owning genome index, the innovation number and the weight of every connection, and an array with the number of connections per genome.
+    """
+
+    owners, innovations, weights, sizes = [], [], [], []
+    for i, gene in enumerate(genes):
+        inno, w = gene.getGeneArrays()
+        owners.append(np.full(len(inno), i, dtype=np.intp))
+        innovations.append(inno)
+        weights.append(w)
+        sizes.append(len(inno))
+
+    return (
+        np.concatenate(owners) if owners else np.zeros(0, dtype=np.intp),
+        np.concatenate(innovations) if innovations else np.zeros(0, dtype=np.int64),
+        np.concatenate(weights) if weights else np.zeros(0),
+        np.array(sizes, dtype=np.intp)
+    )
+
+def compatibilityColumn(flat, species):
+    """compatibilityColumn - Computes the compatibility between every flattened genome and one species representative.
+
+    Each connection of every genome is looked up in the representative's sorted innovations with one searchsorted, and the matches and weight differences are summed per genome with bincount. The result is the same as Species.compare computes for one genome at a time.
+
+    Args:
+        flat (tuple): Genomes encoded by flattenGenes.
+        species (Species): The species to compare against.
+
+    Returns:
+        np.ndarray: The compatibility of every genome with the species.
+    """
+
+    owners, innovations, weights, sizes = flat
+    represent, representWeights = species.representGenes
+    genomes = len(sizes)
+
+    if len(represent) == 0 or len(innovations) == 0:
+        match = np.zeros(genomes)
+        weightSum = np.zeros(genomes)
+    else:
+        pos = np.searchsorted(represent, innovations)
+        pos[pos == len(represent)] = 0
+        hit = represent[pos] == innovations
+        match = np.bincount(owners[hit], minlength=genomes).astype(float)
+        weightSum = np.bincount(
+            owners[hit],
+            weights=np.abs(weights[hit] - representWeights[pos[hit]]),
+            minlength=genomes
+        )
+
+    topoDiff = sizes + len(represent) - 2*match
+    weightDiff = np.full(genomes, 100.0)
+    np.divide(weightSum, match, out=weightDiff, where=match > 0)
+
+    return (topoDiff * species.topoCoeff) + (weightDiff * species.weightCoeff)
+
+def compatibilityMatrix(genes, species):
+    """compatibilityMatrix - Computes the full genome by species compatibility matrix.
+
+    Args:
+        genes (list): List of Genome objects.
+        species (list): List of Species objects.
+
+    Returns:
+        np.ndarray: Matrix of shape (len(genes), len(species)).
+    """
+
+    flat = flattenGenes(genes)
+    matrix = np.empty((len(genes), len(species)))
+    for j, s in enumerate(species):
+        matrix[:, j] = compatibilityColumn(flat, s)
+
+    return matrix
+
+def assignSpecies(genes, species):
+    """assignSpecies - Finds the first species every genome is compatible with, the way speciate assigns them, without changing the species.
+
+    Args:
+        genes (list): List of Genome objects.
+        species (list): List of Species objects.
+
+    Returns:
+        List: The index of the species of every genome, or -1 for the genomes compatible with none of them.
+    """
+
+    if not species or not genes:
+        return [-1] * len(genes)
+
+    flat = flattenGenes(genes)
+    compatible = np.empty((len(genes), len(species)), dtype=bool)
+    for j, s in enumerate(species):
+        compatible[:, j] = s.compatibilityThreshold > compatibilityColumn(flat, s)
+
+    return np.where(compatible.any(axis=1), compatible.argmax(axis=1), -1).tolist()
+
+def speciate(genes, species):
+    """speciate - Assigns every genome to the first species it is compatible with, creating new species as needed.
+
+    This gives the same result as comparing the genomes one by one against the species list, in order. Genomes matching an existing species are assigned from the compatibility matrix in one go. The remaining genomes are handled one new species at a time: the first of them founds a species, and every later remaining genome compatible with it joins.
+
+    Args:
+        genes (list): List of Genome objects, in population order.
+        species (list): List of Species objects. It is cleared and extended in place.
+
+    Returns:
+        Int: The number of genome to species comparisons made.
+    """
+
+    for s in species:
+        s.clear()
+
+    flat = flattenGenes(genes)
+    remaining = np.arange(len(genes))
+    comparisons = len(genes) * len(species)
+
+    if species:
+        compatible = np.empty((len(genes), len(species)), dtype=bool)
+        for j, s in enumerate(species):
+            compatible[:, j] = s.compatibilityThreshold > compatibilityColumn(flat, s)
+
+        found = compatible.any(axis=1)
+        first = compatible.argmax(axis=1)
+        for i in np.flatnonzero(found):
+            species[first[i]].addToSpecies(genes[i])
+        remaining = remaining[~found]
+
+    while remaining.size:
+        s = Species(genes[remaining[0]])
+        species.append(s)
+
+        rest = remaining[1:]
+        compatible = (s.compatibilityThreshold > compatibilityColumn(flat, s))[rest]
+        for i in rest[compatible]:
+            s.addToSpecies(genes[i])
+        remaining = rest[~compatible]
+        comparisons += len(rest)
+
+    return comparisons
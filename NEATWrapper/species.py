@@ -5,9 +5,11 @@
 # ================================
 
 # Built-in Libraries
-from copy import deepcopy
 from random import uniform
 
+# Third-party libraries
+import numpy as np
+
 class Species:
     """Species - Class for a species in the NEAT Algorithm
         
@@ -20,10 +22,11 @@ class Species:
         self.members = [gene]
         self.bestFitness = gene.fitness
         self.bestSteps = gene.steps
-        self.represent = gene.clone()
+        self.champ = gene.clone()
+        self.represent = self.champ
+        self.representGenes = self.represent.getGeneArrays()
         self.staleness = 0
         self.avgFitness = 0
-        self.champ = gene.clone()
 
         self.topoCoeff = 1
         self.weightCoeff = 0.5
@@ -41,9 +44,9 @@ class Species:
             Boolean: Whether or not the differences is above or below the threshold. 
         """
 
-        topoDiff = self.getTopologicalDiff(gene)
-        weightDiff = self.getWeightDiff(gene)
-        
+        excess, disjoint, weightDiff = compareGenes(self.representGenes, gene.getGeneArrays())
+        topoDiff = excess + disjoint
+
         compatibility = (topoDiff*self.topoCoeff) + (weightDiff * self.weightCoeff)
         return (self.compatibilityThreshold > compatibility)
 
@@ -92,8 +95,9 @@ class Species:
         if champ > self.bestFitness:
             self.bestFitness = champ
             self.bestSteps = self.members[0].steps
-            self.represent = self.members[0].clone()
             self.champ = self.members[0].clone()
+            self.represent = self.champ
+            self.representGenes = self.represent.getGeneArrays()
         else:
             self.staleness += 1
 
@@ -109,16 +113,9 @@ class Species:
             Int: The difference in topology as an integer
         """
 
-        connect1 = self.represent.connections
-        connect2 = gene.connections
-        match = 0
-        for i in range(len(connect1)):
-            for j in range(len(connect2)):
-                if connect1[i].innovation == connect2[j].innovation:
-                    match += 1
-                    break
+        excess, disjoint, _ = compareGenes(self.representGenes, gene.getGeneArrays())
 
-        return (len(connect1) + len(connect2) - (2*match))
+        return excess + disjoint
 
     def getWeightDiff(self, gene):
         """getWeightDiff - Finds the difference between the representative gene and a new gene according to the weights in the incoming gene. 
@@ -132,21 +129,9 @@ class Species:
             Int: The difference as an integer. 
         """
 
-        connect1 = self.represent.connections
-        connect2 = gene.connections
-        match = 0
-        totalDiff = 0
-        for i in range(len(connect1)):
-            for j in range(len(connect2)):
-                if connect1[i].innovation == connect2[j].innovation:
-                    match += 1
-                    totalDiff += abs(connect1[i].weight - connect2[j].weight)
-                    break
+        _, _, weightDiff = compareGenes(self.representGenes, gene.getGeneArrays())
 
-        if match == 0:
-            return 100
-
-        return totalDiff/match
+        return weightDiff
 
     def cull(self):
         """cull - Kills of half of the members of the species. 
@@ -224,4 +209,39 @@ class Species:
         # STEP 2: Mutation
         child.mutate(innovation)
 
-        return child
\ No newline at end of file
+        return child
+
+
+def compareGenes(genes1, genes2):
+    """compareGenes - Compares two genomes given as innovation sorted (innovations, weights) arrays, see Genome.getGeneArrays.
+
+    Both innovation arrays are sorted, so the matching genes are found in one pass with searchsorted, and the excess genes are the ones beyond the last innovation of the other genome.
+
+    Args:
+        genes1 (tuple): Sorted innovation numbers and weights of the first genome.
+        genes2 (tuple): Sorted innovation numbers and weights of the second genome.
+
+    Returns:
+        Tuple: The number of excess genes, the number of disjoint genes and the mean weight difference of the matching genes (100 if none match).
+    """
+
+    inno1, weights1 = genes1
+    inno2, weights2 = genes2
+
+    if len(inno1) == 0 or len(inno2) == 0:
+        return len(inno1) + len(inno2), 0, 100
+
+    pos = np.searchsorted(inno2, inno1)
+    pos[pos == len(inno2)] = 0
+    matching = inno2[pos] == inno1
+    match = int(np.count_nonzero(matching))
+
+    excess = int(np.count_nonzero(inno1 > inno2[-1]) + np.count_nonzero(inno2 > inno1[-1]))
+    disjoint = len(inno1) + len(inno2) - 2*match - excess
+
+    if match == 0:
+        return excess, disjoint, 100
+
+    weightDiff = float(np.abs(weights1[matching] - weights2[pos[matching]]).sum()) / match
+
+    return excess, disjoint, weightDiff
@@ -0,0 +1,175 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+"""
+Benchmarks for the hot paths of NEATWrapper.
+
+Runs offline with a synthetic fitness, so gym is not needed. Every benchmark is run for each combination of population size and genome complexity, the results are written to a JSON file and, when a baseline file is given, compared against it. Regressions make the script exit with status 1.
+
+    python -m benchmarks.bench --out bench.json --baseline benchmarks/baseline.json
+    python -m benchmarks.bench --out benchmarks/baseline.json
+"""
+
+# Built-in libraries
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Custom libraries
+import NEATWrapper
+
+IN_NODES = 4
+OUT_NODES = 2
+
+def timeit(fn, minTime=0.1, repeats=3):
+    """
+    Time fn. Calls it in a loop until minTime seconds have passed, repeats that and returns the best time per call in seconds
+    """
+    best = float('inf')
+    for _ in range(repeats):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            fn()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= minTime:
+                break
+        best = min(best, elapsed / calls)
+
+    return best
+
+def syntheticFitness(gene, observations):
+    """
+    Deterministic stand-in for an episode: the number of observations on which the gene picks action 0, plus one
+    """
+    return 1 + sum(1 for obs in observations if gene.getAction(obs) == 0)
+
+def makePopulation(popSize, complexity, seed=0):
+    """
+    Create a population where every gene got complexity extra connections and complexity // 2 extra nodes
+    """
+    random.seed(seed)
+    pop = NEATWrapper.Population(popSize, IN_NODES, OUT_NODES)
+    for gene in pop.population:
+        for _ in range(complexity):
+            gene.addConnection(pop.innovationHistory)
+        for _ in range(complexity // 2):
+            gene.addNode(pop.innovationHistory)
+        gene.generateNet()
+
+    return pop
+
+def evaluate(pop, observations):
+    for gene in pop.population:
+        gene.steps = syntheticFitness(gene, observations)
+
+def benchmarks(popSize, complexity, minTime):
+    """
+    Run all benchmarks for one population size and genome complexity. Returns name -> seconds per call
+    """
+    pop = makePopulation(popSize, complexity)
+    genes = pop.population
+    innovation = pop.innovationHistory
+    observations = [[random.uniform(-1, 1) for _ in range(IN_NODES)] for _ in range(8)]
+    gene = genes[0]
+    obs = observations[0]
+    results = {}
+
+    results['Genome.forward'] = timeit(lambda: gene.forward(obs), minTime)
+    results['Genome.getAction'] = timeit(lambda: gene.getAction(obs), minTime)
+    results['Genome.crossOver'] = timeit(lambda: random.choice(genes).crossOver(random.choice(genes)), minTime)
+
+    # * Mutate a fresh clone every call, so the genomes do not grow during the benchmark.
+    def mutate():
+        child = random.choice(genes).clone()
+        child.mutate(innovation)
+    results['Genome.mutate'] = timeit(mutate, minTime)
+
+    nodes = gene.nodes
+    results['Innovation.checkConnection'] = timeit(lambda: innovation.checkConnection(random.choice(nodes), random.choice(nodes)), minTime)
+
+    evaluate(pop, observations)
+    pop.calcFitness()
+    species = NEATWrapper.Species(genes[0])
+    results['Species.compare'] = timeit(lambda: species.compare(random.choice(genes)), minTime)
+
+    def speciate():
+        pop.species = []
+        pop.speciate()
+    results['Population.speciate'] = timeit(speciate, minTime)
+
+    def naturalSelection():
+        random.seed(1)
+        run = makePopulation(popSize, complexity)
+        evaluate(run, observations)
+        start = time.perf_counter()
+        run.naturalSelection()
+        return time.perf_counter() - start
+    results['Population.naturalSelection'] = min(naturalSelection() for _ in range(3))
+
+    return results
+
+def run(sizes, complexities, minTime):
+    results = {}
+    for popSize in sizes:
+        for complexity in complexities:
+            for name, seconds in benchmarks(popSize, complexity, minTime).items():
+                key = f'{name}[pop={popSize},complexity={complexity}]'
+                results[key] = seconds
+                print(f'{key:60} {seconds*1e6:12.1f} us')
+
+    return results
+
+def compare(results, baseline, tolerance):
+    """
+    Compare results against a baseline. Returns the list of (name, baseline, current) that got slower by more than tolerance
+    """
+    regressions = []
+    for name, seconds in results.items():
+        if name in baseline and seconds > baseline[name] * (1 + tolerance):
+            regressions.append((name, baseline[name], seconds))
+
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks for the NEATWrapper hot paths.')
+    parser.add_argument('--out', default='bench_output.json', help='file to write the results to')
+    parser.add_argument('--baseline', help='results file to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed relative slowdown before flagging a regression')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 500], help='population sizes')
+    parser.add_argument('--complexities', type=int, nargs='+', default=[2, 10], help='number of extra connections per genome')
+    parser.add_argument('--min-time', type=float, default=0.1, help='minimum time per measurement in seconds')
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.complexities, args.min_time)
+    with open(args.out, 'w') as f:
+        json.dump({
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'results': results
+        }, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        for name, before, after in regressions:
+            print(f'REGRESSION {name}: {before*1e6:.1f} us -> {after*1e6:.1f} us')
+        if regressions:
+            return 1
+        print('No regressions against the baseline.')
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,54 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# * Third-party libraries
+import numpy as np
+import pytest
+import sys
+
+sys.path.append('../')
+
+# * Custom Libraries
+import NEATWrapper
+
+def test_registry():
+    for name in NEATWrapper.ACTIVATION_NAMES:
+        assert name in NEATWrapper.ACTIVATIONS
+
+def test_values():
+    x = np.array([-2.0, 0.0, 3.0])
+    assert list(NEATWrapper.identity(x)) == [-2, 0, 3]
+    assert list(NEATWrapper.relu(x)) == [0, 0, 3]
+    assert list(NEATWrapper.sigmoid(x)) == pytest.approx(list(1 / (1 + np.exp(-x))))
+    assert list(NEATWrapper.tanh(x)) == pytest.approx(list(np.tanh(x)))
+
+def test_scalar():
+    for name in NEATWrapper.ACTIVATION_NAMES:
+        for x in [-2.0, 0.0, 3.0]:
+            value = NEATWrapper.SCALAR_ACTIVATIONS[name](x)
+            assert type(value) is float
+            assert value == pytest.approx(float(NEATWrapper.ACTIVATIONS[name](np.array(x))))
+
+def test_sigmoid_large():
+    with np.errstate(all='raise'):
+        assert NEATWrapper.sigmoid(-1000.0) == 0
+        assert NEATWrapper.sigmoid(1000.0) == 1
+
+def test_defaultActivation():
+    assert NEATWrapper.defaultActivation('input') == 'identity'
+    assert NEATWrapper.defaultActivation('hidden') == 'relu'
+    assert NEATWrapper.defaultActivation('output') == 'relu'
+
+def test_registerActivation(registry):
+    NEATWrapper.registerActivation('square', lambda x: x * x)
+    NEATWrapper.registerActivation('square', lambda x: x * x)
+    assert NEATWrapper.ACTIVATION_NAMES.count('square') == 1
+    assert NEATWrapper.ACTIVATIONS['square'](3) == 9
+    assert NEATWrapper.SCALAR_ACTIVATIONS['square'](3) == 9
+
+def test_registry_restored():
+    assert 'square' not in NEATWrapper.ACTIVATIONS
+    assert NEATWrapper.ACTIVATION_NAMES == ['identity', 'relu', 'sigmoid', 'tanh']
@@ -0,0 +1,28 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# * Third-party libraries
+import pytest
+import json
+import sys
+
+sys.path.append('../')
+
+# * Custom Libraries
+from benchmarks import bench
+
+def test_run(tmp_path):
+    out = str(tmp_path / 'bench.json')
+    assert bench.main(['--out', out, '--sizes', '6', '--complexities', '1', '--min-time', '0.001']) == 0
+    with open(out) as f:
+        results = json.load(f)['results']
+    assert 'Population.naturalSelection[pop=6,complexity=1]' in results
+    assert all(seconds > 0 for seconds in results.values())
+
+def test_compare():
+    baseline = {'a': 1.0, 'b': 1.0}
+    results = {'a': 1.1, 'b': 2.0, 'c': 5.0}
+    assert bench.compare(results, baseline, 0.25) == [('b', 1.0, 2.0)]
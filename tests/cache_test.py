@@ -0,0 +1,61 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# * Third-party libraries
+import pytest
+import sys
+
+sys.path.append('../')
+
+# * Custom Libraries
+import NEATWrapper
+
+@pytest.fixture
+def cache():
+    return NEATWrapper.FitnessCache(maxSize=2)
+
+@pytest.fixture
+def gene():
+    innovation = NEATWrapper.Innovation()
+    gene = NEATWrapper.Genome(2, 2, innovation)
+    gene.addNode(innovation)
+    gene.generateNet()
+    return gene
+
+def test_init(cache):
+    assert len(cache) == 0
+    assert cache.hitRate() == 0
+
+def test_get_put(cache):
+    assert cache.get('a') is None
+    cache.put('a', 10)
+    assert cache.get('a') == 10
+    assert cache.hits == 1 and cache.misses == 1
+    assert cache.hitRate() == 0.5
+
+def test_eviction(cache):
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+def test_stats(cache):
+    cache.put('a', 1)
+    cache.get('a')
+    assert cache.stats() == {'size': 1, 'hits': 1, 'misses': 0, 'hitRate': 1.0}
+    cache.clear()
+    assert cache.stats() == {'size': 0, 'hits': 0, 'misses': 0, 'hitRate': 0}
+
+def test_hash(gene):
+    clone = gene.clone()
+    assert clone.getPhenotype().hash() == gene.getPhenotype().hash()
+    assert NEATWrapper.Phenotype(clone).hash() == gene.getPhenotype().hash()
+    [c for c in clone.connections if c.enabled][0].weight += 1
+    assert NEATWrapper.Phenotype(clone).hash() != gene.getPhenotype().hash()
@@ -0,0 +1,127 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# * Third-party libraries
+import pytest
+import random
+import sys
+
+sys.path.append('../')
+
+# * Custom Libraries
+import NEATWrapper
+
+def evaluate(pop):
+    for i, gene in enumerate(pop.population):
+        gene.steps = 1 + sum(abs(c.weight) for c in gene.connections if c.enabled) + i % 3
+
+def genomeState(gene):
+    return (
+        [(n.nodeId, n.nodeType, n.layer) for n in gene.nodes],
+        [(c.innovation, c.inNode.nodeId, c.outNode.nodeId, c.weight, c.enabled) for c in gene.connections],
+        gene.connectedNodes, gene.nextNode, gene.currLayer
+    )
+
+def populationState(pop):
+    return (
+        [genomeState(g) for g in pop.population],
+        [(genomeState(s.champ), s.bestFitness, s.staleness, s.avgFitness) for s in pop.species],
+        dict(pop.innovationHistory.connectionsDone), pop.innovationHistory.innoNo,
+        pop.bestScore, genomeState(pop.bestGene)
+    )
+
+@pytest.fixture
+def pop():
+    random.seed(5)
+    pop = NEATWrapper.Population(20, 3, 2)
+    for _ in range(3):
+        evaluate(pop)
+        pop.naturalSelection()
+    return pop
+
+def test_roundtrip(pop, tmp_path):
+    path = str(tmp_path / 'checkpoint')
+    NEATWrapper.saveCheckpoint(pop, path, currGen=4)
+    loaded, extra = NEATWrapper.loadCheckpoint(path)
+    assert extra == {'currGen': 4}
+    assert loaded.size() == pop.size()
+    assert populationState(loaded) == populationState(pop)
+
+def test_overwrite(pop, tmp_path):
+    path = str(tmp_path / 'checkpoint')
+    NEATWrapper.saveCheckpoint(pop, path)
+    evaluate(pop)
+    pop.naturalSelection()
+    NEATWrapper.saveCheckpoint(pop, path)
+    loaded, _ = NEATWrapper.loadCheckpoint(path)
+    assert populationState(loaded) == populationState(pop)
+
+def test_resume(pop, tmp_path):
+    path = str(tmp_path / 'checkpoint')
+    NEATWrapper.saveCheckpoint(pop, path)
+    for _ in range(3):
+        evaluate(pop)
+        pop.naturalSelection()
+
+    loaded, _ = NEATWrapper.loadCheckpoint(path)
+    for _ in range(3):
+        evaluate(loaded)
+        loaded.naturalSelection()
+    assert populationState(loaded) == populationState(pop)
+
+def test_pruning(tmp_path):
+    random.seed(4)
+    pop = NEATWrapper.Population(20, 2, 2, pruneInnovations=1)
+    for _ in range(3):
+        for i, gene in enumerate(pop.population):
+            gene.steps = i + 1
+        pop.naturalSelection()
+    path = str(tmp_path / 'pruned')
+    NEATWrapper.saveCheckpoint(pop, path)
+    loaded, _ = NEATWrapper.loadCheckpoint(path)
+    history = loaded.innovationHistory
+    assert history.pruneAfter == 1
+    assert history.generation == pop.innovationHistory.generation
+    assert history.lastSeen == pop.innovationHistory.lastSeen
+
+def test_resume_workers(tmp_path):
+    random.seed(6)
+    pop = NEATWrapper.Population(20, 3, 2, profile=True, workers=1)
+    evaluate(pop)
+    pop.naturalSelection()
+    path = str(tmp_path / 'workers')
+    NEATWrapper.saveCheckpoint(pop, path)
+    for _ in range(3):
+        evaluate(pop)
+        pop.naturalSelection()
+
+    loaded, _ = NEATWrapper.loadCheckpoint(path)
+    assert loaded.workers == 1
+    assert loaded.profiler.enabled
+    for _ in range(3):
+        evaluate(loaded)
+        loaded.naturalSelection()
+    assert populationState(loaded) == populationState(pop)
+
+def test_resume_packed(tmp_path):
+    random.seed(6)
+    pop = NEATWrapper.Population(20, 3, 2, packed=True)
+    for _ in range(2):
+        for gene in pop.population:
+            gene.steps = NEATWrapper.syntheticFitness(gene)
+        pop.naturalSelection()
+    path = str(tmp_path / 'packed')
+    NEATWrapper.saveCheckpoint(pop, path)
+
+    loaded, _ = NEATWrapper.loadCheckpoint(path)
+    assert loaded.packed
+    assert all(isinstance(g, NEATWrapper.PackedGenome) for g in loaded.population)
+    for p in (pop, loaded):
+        random.seed(8)
+        for gene in p.population:
+            gene.steps = NEATWrapper.syntheticFitness(gene)
+        p.naturalSelection()
+    assert [g.weights.tolist() for g in loaded.population] == [g.weights.tolist() for g in pop.population]
@@ -0,0 +1,27 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# * Third-party libraries
+import pytest
+import sys
+
+sys.path.append('../')
+
+# * Custom Libraries
+import NEATWrapper
+
+@pytest.fixture
+def registry():
+    # * registerActivation changes the global registry, so put it back for the tests that follow.
+    activations = dict(NEATWrapper.ACTIVATIONS)
+    scalar = dict(NEATWrapper.SCALAR_ACTIVATIONS)
+    names = list(NEATWrapper.ACTIVATION_NAMES)
+    yield
+    NEATWrapper.ACTIVATIONS.clear()
+    NEATWrapper.ACTIVATIONS.update(activations)
+    NEATWrapper.SCALAR_ACTIVATIONS.clear()
+    NEATWrapper.SCALAR_ACTIVATIONS.update(scalar)
+    NEATWrapper.ACTIVATION_NAMES[:] = names
@@ -45,13 +45,6 @@ def test_forward(connection):
     connection.forward()
     assert connection.outNode.value == 20
 
-def test_sigmoid(connection):
-    assert connection.sigmoid(0) == 0.5
-
-def test_relu(connection):
-    assert connection.relu(10) == 10
-    assert connection.relu(-10) == 0
-
 def test_clone(connection):
     clone = connection.clone(connection.enabled)
     assert clone.inNode == connection.inNode
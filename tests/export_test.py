@@ -0,0 +1,82 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# * Third-party libraries
+import importlib.util
+import pytest
+import random
+import sys
+
+sys.path.append('../')
+
+# * Custom Libraries
+import NEATWrapper
+
+@pytest.fixture
+def innovation():
+    return NEATWrapper.Innovation()
+
+@pytest.fixture
+def gene(innovation):
+    random.seed(2)
+    gene = NEATWrapper.Genome(4, 2, innovation)
+    for _ in range(8):
+        gene.addConnection(innovation)
+        gene.addNode(innovation)
+    names = ['sigmoid', 'tanh', 'identity', 'relu']
+    for i, node in enumerate(gene.nodes[gene.inNodes:]):
+        node.activation = names[i % len(names)]
+    gene.generateNet()
+    return gene
+
+def test_forward(gene):
+    policy = NEATWrapper.compileGenome(gene)
+    for _ in range(20):
+        obs = [random.uniform(-2, 2) for _ in range(4)]
+        assert policy.forward(obs) == pytest.approx(list(gene.getPhenotype().forward(obs)))
+        assert policy.getAction(obs) == gene.getAction(obs)
+
+def test_packed(gene):
+    assert NEATWrapper.exportSource(gene.pack()) == NEATWrapper.exportSource(gene)
+
+def test_dead_nodes(innovation):
+    gene = NEATWrapper.Genome(2, 2, innovation)
+    gene.addNode(innovation)
+    dead = gene.nodes[-1]
+    for connection in gene.connections:
+        if connection.inNode is dead:
+            connection.enabled = False
+    source = NEATWrapper.exportSource(gene)
+    assert f'n{dead.nodeId}' not in source
+    assert NEATWrapper.compileGenome(gene).forward([1, 1]) == [0.0, 0.0]
+
+def test_constant_folding(innovation):
+    gene = NEATWrapper.Genome(2, 2, innovation)
+    gene.addNode(innovation)
+    hidden = gene.nodes[-1]
+    hidden.activation = 'sigmoid'
+    for connection in gene.connections:
+        if connection.outNode is hidden:
+            connection.enabled = False
+    gene.generateNet()
+    policy = NEATWrapper.compileGenome(gene)
+    assert f'n{hidden.nodeId}' not in policy.source
+    assert policy.forward([1, 1]) == pytest.approx(list(gene.getPhenotype().forward([1, 1])))
+
+def test_unknown_activation(gene, registry):
+    NEATWrapper.registerActivation('cube', lambda x: x ** 3)
+    gene.nodes[-1].activation = 'cube'
+    with pytest.raises(ValueError):
+        NEATWrapper.exportSource(gene)
+
+def test_exportModule(gene, tmp_path):
+    path = str(tmp_path / 'policy.py')
+    NEATWrapper.exportModule(gene, path)
+    spec = importlib.util.spec_from_file_location('policy', path)
+    policy = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(policy)
+    assert 'NEATWrapper' not in open(path).read().split('\n', 1)[1]
+    assert policy.getAction([1, 0, -1, 2]) == gene.getAction([1, 0, -1, 2])
@@ -73,18 +73,6 @@ def test_addConnection(gene, innovation):
     gene.addConnection(innovation)
     assert len(gene.connections) == 2
 
-def test_nodesAreSimilar(gene):
-    node1 = gene.nodes[0]
-    node2 = gene.nodes[1]
-    # * Testing for nodes in same layer and node 2 being an input node
-    assert gene.nodesAreSimilar(node1, node2)
-    # * Testing a good pair of nodes
-    node2 = gene.nodes[2]
-    assert not gene.nodesAreSimilar(node1, node2)
-    # * Testing for node 1 being output node
-    node1 = gene.nodes[3]
-    assert gene.nodesAreSimilar(node1, node2)
-
 def test_addNode(gene, innovation):
     gene.addNode(innovation)
     assert len(gene.nodes) == 5
@@ -140,3 +128,82 @@ def test_clone(gene, innovation):
     assert len(gene_clone.connectedNodes) == len(gene.connectedNodes)
     assert gene_clone.nextNode == gene.nextNode
     assert gene_clone.currLayer == gene.currLayer
+
+def test_clone_own_nodes(gene, gene2, innovation):
+    gene.addConnection(innovation)
+    gene.addNode(innovation)
+    for other in (gene.clone(), gene.crossOver(gene2)):
+        for connection in other.connections:
+            assert any(connection.inNode is node for node in other.nodes)
+            assert any(connection.outNode is node for node in other.nodes)
+            assert not any(connection.inNode is node for node in gene.nodes)
+
+def test_incremental_network(gene, gene2, innovation):
+    for _ in range(30):
+        gene.addConnection(innovation)
+        gene.addNode(innovation)
+    for other in (gene, gene.clone(), gene.crossOver(gene2)):
+        wired = [list(node.connections) for node in other.getNetwork()]
+        network = list(other.network)
+        out = other.forward([1, -2])
+        other.generateNet()
+        assert network == other.network
+        assert all(a is b for a, b in zip(network, other.network))
+        assert wired == [node.connections for node in other.network]
+        assert out == other.forward([1, -2])
+
+def test_lazy_network(gene, innovation):
+    gene.addNode(innovation)
+    clone = gene.clone()
+    assert clone.network is None
+    assert all(not node.connections for node in clone.nodes)
+    clone.addConnection(innovation)
+    clone.addNode(innovation)
+    assert clone.network is not None
+    network = list(clone.network)
+    clone.generateNet()
+    assert network == clone.network
+    assert clone.forward([1, -2]) == pytest.approx(list(clone.getPhenotype().forward([1, -2])))
+
+def test_maxConnections(gene, innovation):
+    for _ in range(10):
+        gene.addNode(innovation)
+        gene.addConnection(innovation)
+    valid = sum(
+        1 for node1 in gene.nodes for node2 in gene.nodes
+        if node1.layer < node2.layer
+    )
+    assert gene.maxConnections == valid
+    clone = gene.clone()
+    clone.generateNet()
+    assert clone.maxConnections == valid
+
+    while not gene.fullyConnected():
+        gene.addConnection(innovation)
+    assert len(gene.connections) == valid
+    assert len(gene.connectedNodes) == valid
+
+def test_addConnection_dense(gene, innovation, monkeypatch):
+    # * No random tries, so every pair is drawn from the counted unconnected pairs.
+    monkeypatch.setattr(NEATWrapper.genome, 'ADD_CONNECTION_TRIES', 0)
+    for _ in range(4):
+        gene.addNode(innovation)
+    while len(gene.connectedNodes) < gene.maxConnections - 3:
+        gene.addConnection(innovation)
+    free = {
+        (node1.nodeId, node2.nodeId) for node1 in gene.nodes for node2 in gene.nodes
+        if gene.canConnect(node1, node2)
+    }
+    assert len(free) == 3
+
+    counts = dict.fromkeys(free, 0)
+    for _ in range(600):
+        clone = gene.clone()
+        clone.addConnection(innovation)
+        added = clone.connections[-1]
+        counts[(added.inNode.nodeId, added.outNode.nodeId)] += 1
+    assert all(150 < n < 250 for n in counts.values())
+
+    while not gene.fullyConnected():
+        gene.addConnection(innovation)
+    assert len(gene.connectedNodes) == gene.maxConnections
@@ -0,0 +1,37 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# * Third-party libraries
+import pytest
+import os
+import subprocess
+import sys
+
+# * Importing NEATWrapper in a fresh interpreter should stay below this many seconds.
+MAX_IMPORT_TIME = 1.0
+
+SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import NEATWrapper
+print(time.perf_counter() - start)
+print(' '.join(sorted(m for m in ('gym', 'networkx', 'matplotlib') if m in sys.modules)))
+"""
+
+@pytest.fixture
+def startup():
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    out = subprocess.check_output([sys.executable, '-c', SCRIPT], cwd=root, universal_newlines=True)
+    lines = out.splitlines()
+    return float(lines[0]), lines[1].split() if len(lines) > 1 else []
+
+def test_no_heavy_imports(startup):
+    _, heavy = startup
+    assert heavy == []
+
+def test_import_time(startup):
+    seconds, _ = startup
+    assert seconds < MAX_IMPORT_TIME
@@ -43,3 +43,53 @@ def test_checkConnection(innovation, node1, node2, node3):
     conn3 = innovation.checkConnection(node1, node3)
     assert conn3.innovation == 2
     assert len(innovation.connectionsDone) == 2
+
+def test_getInnovation(innovation):
+    assert innovation.getInnovation(1, 2) == 1
+    assert innovation.getInnovation(1, 3) == 2
+    assert innovation.getInnovation(1, 2) == 1
+    assert innovation.connectionsDone == {(1, 2): 1, (1, 3): 2}
+    assert innovation.innoNo == 3
+
+def test_size(innovation, node1, node2, node3):
+    assert innovation.size() == 0
+    for _ in range(3):
+        innovation.checkConnection(node1, node2)
+        innovation.checkConnection(node1, node3)
+    assert innovation.size() == 2
+
+class Gene:
+    """
+    Stand-in for a living genome, with connections between the given node id pairs
+    """
+    def __init__(self, pairs):
+        self.connections = [
+            NEATWrapper.Connection(NEATWrapper.Node(inId, 'input'), NEATWrapper.Node(outId, 'output'), 1)
+            for inId, outId in pairs
+        ]
+
+    def getConnectionIds(self):
+        return [(c.inNode.nodeId, c.outNode.nodeId) for c in self.connections]
+
+def test_prune_disabled(innovation):
+    innovation.getInnovation(1, 2)
+    assert innovation.prune([]) == 0
+    assert innovation.size() == 1
+
+def test_prune():
+    innovation = NEATWrapper.Innovation(pruneAfter=2)
+    innovation.getInnovation(1, 2)
+    innovation.getInnovation(1, 3)
+    living = [Gene([(1, 2)])]
+    assert innovation.prune(living) == 0
+    assert innovation.prune(living) == 1
+    assert innovation.connectionsDone == {(1, 2): 1}
+    assert innovation.getInnovation(1, 3) == 3
+
+def test_memoryFootprint(innovation):
+    empty = innovation.memoryFootprint()
+    for i in range(100):
+        innovation.getInnovation(i, i + 1)
+    footprint = innovation.memoryFootprint()
+    assert footprint['entries'] == 100
+    assert footprint['bytes'] > empty['bytes']
@@ -0,0 +1,94 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# * Third-party libraries
+import os
+import pytest
+import socket
+import sys
+
+sys.path.append('../')
+
+# * Custom Libraries
+import NEATWrapper
+
+def freePort():
+    with socket.socket() as s:
+        s.bind(('localhost', 0))
+        return s.getsockname()[1]
+
+def failingFitness(gene):
+    raise ValueError('simulator crashed')
+
+def exitingFitness(gene):
+    os._exit(3)
+
+@pytest.fixture
+def population():
+    return NEATWrapper.Population(10, 3, 2)
+
+def test_syntheticFitness(population):
+    for gene in population.population:
+        reward = NEATWrapper.syntheticFitness(gene)
+        assert 1 <= reward <= 17
+        assert reward == NEATWrapper.syntheticFitness(gene)
+
+def test_migrate(population):
+    other = NEATWrapper.Population(1, 3, 2)
+    gene = other.population[0]
+    for _ in range(3):
+        gene.addNode(other.innovationHistory)
+        gene.addConnection(other.innovationHistory)
+
+    for i, g in enumerate(population.population):
+        g.steps = 10 - i
+    gene.steps = 20
+    NEATWrapper.migrate(population, [gene.pack()])
+    migrant = population.population[-1]
+    assert migrant.steps == 20
+    assert len(population.population) == 10
+    assert sorted(g.steps for g in population.population) == [2, 3, 4, 5, 6, 7, 8, 9, 10, 20]
+    assert len(migrant.connections) == len(gene.connections)
+    history = population.innovationHistory
+    for connection in migrant.connections:
+        assert connection.innovation == history.getInnovation(connection.inNode.nodeId, connection.outNode.nodeId)
+
+def test_islands_local():
+    islands = NEATWrapper.Islands(2, 20, 3, 2, interval=2, migrants=2, seed=1)
+    results = islands.run(4)
+    assert [result['index'] for result in results] == [0, 1]
+    for result in results:
+        assert len(result['history']) == 4
+        assert result['bestScore'] == max(result['history'])
+    best = islands.getBestGene()
+    assert NEATWrapper.syntheticFitness(best) == max(result['bestScore'] for result in results)
+
+def test_islands_reproducible():
+    first = NEATWrapper.Islands(2, 20, 3, 2, interval=2, seed=3).run(4)
+    second = NEATWrapper.Islands(2, 20, 3, 2, interval=2, seed=3).run(4)
+    assert [r['history'] for r in first] == [r['history'] for r in second]
+
+def test_islands_socket():
+    addresses = [('localhost', freePort()) for _ in range(3)]
+    transport = NEATWrapper.SocketTransport(addresses, authkey=b'neat')
+    results = NEATWrapper.Islands(3, 10, 3, 2, interval=1, transport=transport).run(3)
+    assert len(results) == 3
+
+def test_islands_error():
+    with pytest.raises(RuntimeError, match='simulator crashed'):
+        NEATWrapper.Islands(2, 10, 3, 2, fitness=failingFitness, interval=1).run(3)
+
+def test_islands_exit():
+    with pytest.raises(RuntimeError, match='exited with code 3'):
+        NEATWrapper.Islands(2, 10, 3, 2, fitness=exitingFitness, interval=1).run(3)
+
+def test_socket_send_error():
+    addresses = [('localhost', freePort()) for _ in range(2)]
+    transport = NEATWrapper.SocketTransport(addresses, authkey=b'neat', retries=2, delay=0.01)
+    transport.open(0)
+    transport.send(1, 'migrants')
+    with pytest.raises(ConnectionRefusedError):
+        transport.close()
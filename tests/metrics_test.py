@@ -0,0 +1,46 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# * Third-party libraries
+import pytest
+import json
+import sys
+
+sys.path.append('../')
+
+# * Custom Libraries
+import NEATWrapper
+
+@pytest.fixture
+def pop():
+    return NEATWrapper.Population(4, 2, 2)
+
+def test_stats():
+    assert NEATWrapper.stats([1, 2, 3]) == {'mean': 2.0, 'std': pytest.approx(0.8165, abs=1e-4), 'min': 1.0, 'max': 3.0}
+
+def test_generationRecord(pop):
+    record = NEATWrapper.generationRecord(3, [1, 2, 3, 4], pop.population)
+    assert record['type'] == 'generation'
+    assert record['generation'] == 3
+    assert record['genomes'] == 4
+    assert record['reward']['max'] == 4
+    assert record['nodes']['mean'] == 4
+    assert record['connections']['max'] == 1
+    json.dumps(record)
+
+def test_genomeRecord(pop):
+    record = NEATWrapper.genomeRecord(1, 2, 10, pop.getGene(2))
+    assert record == {'type': 'genome', 'generation': 1, 'index': 2, 'reward': 10.0, 'nodes': 4, 'connections': 1}
+
+def test_JSONLSink(tmp_path, pop):
+    path = str(tmp_path / 'metrics.jsonl')
+    sink = NEATWrapper.JSONLSink(path)
+    sink(NEATWrapper.generationRecord(1, [1, 2, 3, 4], pop.population))
+    sink({'type': 'generation', 'generation': 2})
+    sink.close()
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    assert [r['generation'] for r in records] == [1, 2]
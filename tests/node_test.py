@@ -74,4 +74,13 @@ def test_forward(node, conn):
     node.addConnection(conn)
     node.setValue(10)
     node.forward()
-    assert conn.outNode.value == 10
\ No newline at end of file
+    assert conn.outNode.value == 10
+
+def test_activation(node, output_node):
+    assert node.activation == 'identity'
+    assert output_node.activation == 'relu'
+    output_node.setValue(-3)
+    output_node.forward()
+    assert output_node.value == 0
+    output_node.activation = 'tanh'
+    assert output_node.clone().activation == 'tanh'
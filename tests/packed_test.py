@@ -0,0 +1,81 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# * Third-party libraries
+import pytest
+import random
+import sys
+
+sys.path.append('../')
+
+# * Custom Libraries
+import NEATWrapper
+
+@pytest.fixture
+def innovation():
+    return NEATWrapper.Innovation()
+
+@pytest.fixture
+def gene(innovation):
+    random.seed(4)
+    gene = NEATWrapper.Genome(3, 2, innovation)
+    for _ in range(4):
+        gene.addConnection(innovation)
+    for _ in range(2):
+        gene.addNode(innovation)
+    gene.steps = 12
+    gene.generateNet()
+    return gene
+
+@pytest.fixture
+def packed(gene):
+    return gene.pack()
+
+def test_init(gene, packed):
+    assert isinstance(packed, NEATWrapper.PackedGenome)
+    assert list(packed.nodeIds) == [node.nodeId for node in gene.nodes]
+    assert list(packed.innovations) == [c.innovation for c in gene.connections]
+    assert list(packed.enabled) == [c.enabled for c in gene.connections]
+    assert packed.nextNode == gene.nextNode
+    assert packed.currLayer == gene.currLayer
+    assert packed.steps == 12
+
+def test_unpack(gene, packed):
+    unpacked = packed.unpack()
+    assert isinstance(unpacked, NEATWrapper.Genome)
+    assert unpacked.nodes == gene.nodes
+    assert unpacked.connectedNodes == gene.connectedNodes
+    assert unpacked.steps == gene.steps
+    for c1, c2 in zip(unpacked.connections, gene.connections):
+        assert (c1.innovation, c1.weight, c1.enabled) == (c2.innovation, c2.weight, c2.enabled)
+        assert any(c1.inNode is node for node in unpacked.nodes)
+        assert any(c1.outNode is node for node in unpacked.nodes)
+
+def test_clone(packed):
+    clone = packed.clone()
+    clone.weights[0] += 1
+    assert clone.weights[0] != packed.weights[0]
+    assert list(clone.innovations) == list(packed.innovations)
+
+def test_forward(gene, packed):
+    for _ in range(10):
+        obs = [random.uniform(-2, 2) for _ in range(3)]
+        assert packed.forward(obs) == pytest.approx(gene.forward(obs))
+        assert packed.getAction(obs) == gene.getAction(obs)
+
+def test_getGeneArrays(gene, packed):
+    for a, b in zip(packed.getGeneArrays(), gene.getGeneArrays()):
+        assert list(a) == list(b)
+
+def test_nbytes(packed):
+    assert packed.nbytes() > 0
+
+def test_activations(gene):
+    gene.nodes[-1].activation = 'tanh'
+    unpacked = gene.pack().unpack()
+    assert [node.activation for node in unpacked.nodes] == [node.activation for node in gene.nodes]
+    arrays = NEATWrapper.concatenatePacked([gene, gene])
+    assert [NEATWrapper.ACTIVATION_NAMES[a] for a in NEATWrapper.splitPacked(arrays)[1].nodeActivations] == [node.activation for node in gene.nodes]
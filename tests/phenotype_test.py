@@ -0,0 +1,136 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# * Third-party libraries
+import pytest
+import random
+import sys
+
+sys.path.append('../')
+
+# * Custom Libraries
+import NEATWrapper
+
+@pytest.fixture
+def innovation():
+    return NEATWrapper.Innovation()
+
+@pytest.fixture
+def gene(innovation):
+    random.seed(1)
+    gene = NEATWrapper.Genome(4, 2, innovation)
+    for _ in range(6):
+        gene.addConnection(innovation)
+    for _ in range(3):
+        gene.addNode(innovation)
+    gene.connections[0].enabled = False
+    gene.generateNet()
+    return gene
+
+def test_init(gene):
+    phenotype = gene.phenotype
+    assert isinstance(phenotype, NEATWrapper.Phenotype)
+    assert phenotype.size == len(gene.nodes)
+    assert list(phenotype.outputs) == [4, 5]
+    assert sum(len(src) for src, _, _ in phenotype.layers) == len([c for c in gene.connections if c.enabled])
+
+def test_layers_sorted(gene):
+    layers = [gene.nodes[src[0]].layer for src, _, _ in gene.phenotype.layers]
+    assert layers == sorted(layers)
+
+def test_forward(gene):
+    for _ in range(20):
+        obs = [random.uniform(-2, 2) for _ in range(4)]
+        expected = gene.forward(obs)
+        output = gene.phenotype.forward(obs)
+        assert list(output) == pytest.approx(expected)
+
+def test_getAction(gene):
+    for _ in range(20):
+        obs = [random.uniform(-2, 2) for _ in range(4)]
+        output = gene.forward(obs)
+        assert gene.getAction(obs) == output.index(max(output))
+
+def test_mutate_invalidates(gene, innovation):
+    gene.addConnection(innovation)
+    assert gene.phenotype is None
+    gene.getAction([1, 1, 1, 1])
+    assert isinstance(gene.phenotype, NEATWrapper.Phenotype)
+
+def test_forwardBatch(gene):
+    obs = [[random.uniform(-2, 2) for _ in range(4)] for _ in range(16)]
+    output = gene.forwardBatch(obs)
+    assert output.shape == (16, 2)
+    for row, o in zip(output, obs):
+        assert list(row) == pytest.approx(list(gene.phenotype.forward(o)))
+
+def test_getActionBatch(gene):
+    obs = [[random.uniform(-2, 2) for _ in range(4)] for _ in range(16)]
+    actions = gene.getActionBatch(obs)
+    assert actions.shape == (16,)
+    assert list(actions) == [gene.getAction(o) for o in obs]
+
+def test_populationPhenotype(gene, innovation):
+    genes = [gene, NEATWrapper.Genome(4, 2, innovation), gene.clone()]
+    genes[2].addNode(innovation)
+    genes[2].addConnection(innovation)
+    packed = NEATWrapper.PopulationPhenotype(genes)
+    assert packed.size == sum(len(g.nodes) for g in genes)
+
+    obs = [[random.uniform(-2, 2) for _ in range(4)] for _ in genes]
+    output = packed.forward(obs)
+    assert output.shape == (3, 2)
+    for row, g, o in zip(output, genes, obs):
+        assert list(row) == pytest.approx(list(NEATWrapper.Phenotype(g).forward(o)))
+    assert list(packed.getActions(obs)) == [g.getAction(o) for g, o in zip(genes, obs)]
+
+def test_activations(gene, innovation):
+    before = gene.phenotype.hash()
+    names = ['sigmoid', 'tanh', 'identity', 'relu']
+    for i, node in enumerate(gene.nodes[gene.inNodes:]):
+        node.activation = names[i % len(names)]
+    phenotype = gene.phenotype = NEATWrapper.Phenotype(gene)
+    for _ in range(20):
+        obs = [random.uniform(-2, 2) for _ in range(4)]
+        assert list(phenotype.forward(obs)) == pytest.approx(gene.forward(obs))
+    assert phenotype.hash() != before
+
+    obs = [[random.uniform(-2, 2) for _ in range(4)] for _ in range(5)]
+    for row, o in zip(phenotype.forwardBatch(obs), obs):
+        assert list(row) == pytest.approx(list(phenotype.forward(o)))
+
+    other = NEATWrapper.Genome(4, 2, innovation)
+    packed = NEATWrapper.PopulationPhenotype([other, gene])
+    obs = [[random.uniform(-2, 2) for _ in range(4)] for _ in range(2)]
+    output = packed.forward(obs)
+    assert list(output[1]) == pytest.approx(list(phenotype.forward(obs[1])))
+
+def test_activation_groups(gene):
+    # * Inputs are identity and everything else is relu by default, so no layer needs indexing.
+    assert gene.phenotype.activations[0] == []
+    assert all(groups == [('relu', None)] for groups in gene.phenotype.activations[1:])
+    assert gene.phenotype.outputActivations == [('relu', None)]
+
+    gene.nodes[gene.inNodes].activation = 'tanh'
+    groups = dict(NEATWrapper.Phenotype(gene).outputActivations)
+    assert list(groups['tanh']) == [0]
+    assert list(groups['relu']) == [1]
+
+def test_select(gene, innovation):
+    names = ['sigmoid', 'tanh', 'identity', 'relu']
+    genes = [gene, NEATWrapper.Genome(4, 2, innovation), gene.clone(), gene.clone()]
+    genes[2].addNode(innovation)
+    for i, node in enumerate(genes[3].nodes[genes[3].inNodes:]):
+        node.activation = names[i % len(names)]
+    for g in genes:
+        g.phenotype = None
+    packed = NEATWrapper.PopulationPhenotype(genes)
+
+    for subset in ([3, 0], [2], [1, 3, 2], [0, 1, 2, 3]):
+        selected = packed.select(subset)
+        obs = [[random.uniform(-2, 2) for _ in range(4)] for _ in subset]
+        expected = NEATWrapper.PopulationPhenotype([genes[i] for i in subset]).forward(obs)
+        assert selected.forward(obs) == pytest.approx(expected)
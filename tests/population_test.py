@@ -6,6 +6,7 @@
 
 # ThirdParty Libraries
 import pytest
+import random
 import sys
 from math import inf
 
@@ -138,3 +139,66 @@ def test_getAvgFitnessSum(pop):
     assert isinstance(avgfit, float)
     assert avgfit == _sum
 
+
+def test_getActions(pop):
+    obs = [[i, -i] for i in range(pop.size())]
+    actions = pop.getActions(obs)
+    assert len(actions) == pop.size()
+    assert list(actions) == [pop.getGene(i).getAction(obs[i]) for i in range(pop.size())]
+
+def evolve(workers, generations=4, seed=5, **kwargs):
+    random.seed(seed)
+    pop = NEATWrapper.Population(30, 3, 2, workers=workers, **kwargs)
+    for _ in range(generations):
+        for gene in pop.population:
+            gene.steps = NEATWrapper.syntheticFitness(gene)
+        pop.naturalSelection()
+    pop.close()
+    return pop
+
+def test_reproduceJobs():
+    pop = evolve(1)
+    assert len(pop.population) == pop.size()
+    history = pop.innovationHistory
+    for gene in pop.population:
+        for connection in gene.connections:
+            assert connection.innovation == history.getInnovation(connection.inNode.nodeId, connection.outNode.nodeId)
+
+@pytest.mark.parametrize('workers', [2, 3])
+def test_reproduceJobs_workers(workers):
+    one, many = evolve(1), evolve(workers)
+    assert len(many.population) == many.size()
+    assert [g.pack().innovations.tolist() for g in one.population] == [g.pack().innovations.tolist() for g in many.population]
+    assert [g.pack().weights.tolist() for g in one.population] == [g.pack().weights.tolist() for g in many.population]
+    assert [g.pack().inIds.tolist() for g in one.population] == [g.pack().inIds.tolist() for g in many.population]
+    assert one.innovationHistory.connectionsDone == many.innovationHistory.connectionsDone
+
+@pytest.mark.parametrize('workers', [None, 1])
+def test_packed(workers):
+    unpacked = evolve(workers, pruneInnovations=2)
+    packed = evolve(workers, pruneInnovations=2, packed=True)
+    assert all(isinstance(g, NEATWrapper.PackedGenome) for g in packed.population)
+    assert all(isinstance(s.champ, NEATWrapper.PackedGenome) for s in packed.species)
+    assert [g.pack().innovations.tolist() for g in packed.population] == [g.pack().innovations.tolist() for g in unpacked.population]
+    assert [g.pack().weights.tolist() for g in packed.population] == [g.pack().weights.tolist() for g in unpacked.population]
+    assert packed.innovationHistory.connectionsDone == unpacked.innovationHistory.connectionsDone
+    assert packed.bestScore == unpacked.bestScore
+
+def test_reproduceJobs_skips_empty(monkeypatch):
+    counts = []
+    reproduce = NEATWrapper.population._reproduce
+    def record(job):
+        counts.append(job[2])
+        return reproduce(job)
+    monkeypatch.setattr(NEATWrapper.population, '_reproduce', record)
+
+    random.seed(2)
+    pop = NEATWrapper.Population(20, 3, 2, workers=1)
+    big, small = NEATWrapper.Species(pop.getGene(0)), NEATWrapper.Species(pop.getGene(1))
+    big.avgFitness, small.avgFitness = 19, 1
+    pop.species = [big, small]
+
+    population = pop.reproduceJobs()
+    # * The small species only keeps its champion, so only the big one is shipped to a worker.
+    assert counts == [18]
+    assert len(population) == 20
@@ -0,0 +1,70 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# * Third-party libraries
+import pytest
+import random
+import sys
+
+sys.path.append('../')
+
+# * Custom Libraries
+import NEATWrapper
+
+PHASES = [
+    'calcFitness', 'speciate', 'sortSpecies', 'cullSpecies', 'findBestGene',
+    'killStaleSpecies', 'killBadSpecies', 'reproduction', 'generateNet'
+]
+
+def evaluate(pop):
+    for i, gene in enumerate(pop.population):
+        gene.steps = i + 1
+
+def test_phase():
+    profiler = NEATWrapper.Profiler()
+    with profiler.phase('a'):
+        pass
+    with profiler.phase('a'):
+        pass
+    profiler.count('b')
+    profiler.count('b', 2)
+    report = profiler.report()
+    assert report.timings['a'] >= 0
+    assert report.counters == {'b': 3}
+    assert report.total() == report.timings['a']
+    assert 'Profile Report' in repr(report)
+
+def test_disabled():
+    profiler = NEATWrapper.Profiler(enabled=False)
+    with profiler.phase('a'):
+        profiler.count('b')
+    report = profiler.report()
+    assert report.timings == {} and report.counters == {}
+
+def test_naturalSelection():
+    random.seed(6)
+    pop = NEATWrapper.Population(10, 2, 2, profile=True)
+    assert pop.report is None
+    evaluate(pop)
+    pop.naturalSelection()
+    assert isinstance(pop.report, NEATWrapper.ProfileReport)
+    assert sorted(pop.report.timings) == sorted(PHASES)
+    assert pop.report.counters['comparisons'] > 0
+    assert pop.report.counters['clones'] >= pop.report.counters['species']
+
+def test_naturalSelection_packed():
+    random.seed(6)
+    pop = NEATWrapper.Population(10, 2, 2, profile=True, packed=True)
+    evaluate(pop)
+    pop.naturalSelection()
+    assert pop.report.counters['species'] > 0
+    assert pop.report.counters['clones'] >= pop.report.counters['species']
+
+def test_naturalSelection_disabled():
+    pop = NEATWrapper.Population(10, 2, 2)
+    evaluate(pop)
+    pop.naturalSelection()
+    assert pop.report is None
@@ -0,0 +1,72 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# * Third-party libraries
+import pytest
+import random
+import sys
+
+sys.path.append('../')
+
+# * Custom Libraries
+import NEATWrapper
+
+@pytest.fixture
+def means():
+    return [i * 10 for i in range(20)]
+
+def noisy(means, noise):
+    rng = random.Random(0)
+    return lambda jobs: [means[i] + rng.gauss(0, noise) for i in jobs]
+
+def test_deterministic(means):
+    steps, total = NEATWrapper.race(noisy(means, 0), len(means), episodes=8)
+    assert steps == means
+    # * Two equal rewards are not trusted as zero variance, so every gene gets a second round.
+    assert total == 4 * len(means)
+
+def test_single_episode(means):
+    steps, total = NEATWrapper.race(noisy(means, 0), len(means), episodes=1)
+    assert steps == means
+    assert total == len(means)
+
+def test_budget(means):
+    steps, total = NEATWrapper.race(noisy(means, 5), len(means), episodes=16)
+    assert 2 * len(means) <= total < 16 * len(means)
+    assert len(steps) == len(means)
+
+def test_ranking(means):
+    steps, _ = NEATWrapper.race(noisy(means, 5), len(means), episodes=16)
+    best = sorted(range(len(means)), key=lambda i: steps[i])[len(means) // 2:]
+    assert best == list(range(len(means) // 2, len(means)))
+
+def test_evaluate_jobs(means):
+    calls = []
+    def evaluate(jobs):
+        calls.append(list(jobs))
+        return [means[i] + random.gauss(0, 5) for i in jobs]
+
+    NEATWrapper.race(evaluate, len(means), episodes=8)
+    assert sorted(calls[0]) == sorted(list(range(len(means))) * 2)
+    for jobs in calls[1:]:
+        assert len(jobs) > 0
+        assert set(jobs) <= set(calls[0])
+
+def test_groups():
+    # * Gene 2 is above the overall median, but the cutoff of its group is between it and gene 3.
+    means = [0, 1, 10, 11, 12, 13]
+    counts = [0] * len(means)
+    rng = random.Random(0)
+    def evaluate(jobs):
+        for i in jobs:
+            counts[i] += 1
+        return [means[i] + rng.gauss(0, 0.5) for i in jobs]
+
+    NEATWrapper.race(evaluate, len(means), episodes=16, groups=[0, 0, 1, 1, 1, 1])
+    # * The group of gene 0 and 1 is too small to be culled, so they are safe.
+    assert counts[:2] == [2, 2]
+    assert counts[2] == 2 and counts[5] == 2
+    assert counts[3] > 2 and counts[4] > 2
@@ -0,0 +1,122 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# * Third-party libraries
+import asyncio
+import json
+import pytest
+import sys
+import threading
+
+sys.path.append('../')
+
+# * Custom Libraries
+import NEATWrapper
+
+class FakeEvaluator:
+    """
+    Evaluator whose episodes take delay seconds and return the index of the gene, while tracking the number of episodes started and in flight. The episodes of the failing genes raise ConnectionError
+    """
+    def __init__(self, delay=0.01, slow=(), failing=()):
+        self.delay = delay
+        self.slow = slow
+        self.failing = failing
+        self.started = 0
+        self.inFlight = 0
+        self.maxInFlight = 0
+
+    async def evaluate(self, gene):
+        self.started += 1
+        self.inFlight += 1
+        self.maxInFlight = max(self.maxInFlight, self.inFlight)
+        try:
+            await asyncio.sleep(1 if gene in self.slow else self.delay)
+            if gene in self.failing:
+                raise ConnectionError('simulator went away')
+            return gene
+        finally:
+            self.inFlight -= 1
+
+async def handleEpisode(reader, writer):
+    """
+    Stand-in simulator: the observation is [step, 1], every step gives reward 1 and the episode ends after 5 steps or when the action is 1
+    """
+    step = 0
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        message = json.loads(line.decode())
+        if message.get('reset'):
+            step = 0
+            answer = {'obs': [step, 1]}
+        else:
+            step += 1
+            answer = {'obs': [step, 1], 'reward': 1, 'done': step >= 5 or message['action'] == 1}
+        writer.write((json.dumps(answer) + '\n').encode())
+        await writer.drain()
+    writer.close()
+
+async def startServer():
+    return await asyncio.start_server(handleEpisode, 'localhost', 0)
+
+async def stopServer(server):
+    server.close()
+    # * Cancel the episode handlers still running, so no task is pending when the loop is closed.
+    tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await server.wait_closed()
+
+def localEpisode(gene):
+    for step in range(5):
+        if gene.getAction([step, 1]) == 1:
+            return step + 1
+    return 5
+
+@pytest.fixture
+def server():
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(startServer())
+    thread = threading.Thread(target=loop.run_forever)
+    thread.daemon = True
+    thread.start()
+    yield server.sockets[0].getsockname()[1]
+    asyncio.run_coroutine_threadsafe(stopServer(server), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+def test_order():
+    scheduler = NEATWrapper.AsyncScheduler(FakeEvaluator(), concurrency=4)
+    assert scheduler.run(list(range(20))) == list(range(20))
+
+def test_concurrency():
+    evaluator = FakeEvaluator()
+    NEATWrapper.AsyncScheduler(evaluator, concurrency=3).run(list(range(20)))
+    assert evaluator.maxInFlight == 3
+
+def test_timeout():
+    scheduler = NEATWrapper.AsyncScheduler(FakeEvaluator(slow=(2, 5)), concurrency=8, timeout=0.1, timeoutReward=-1)
+    steps = scheduler.run(list(range(8)))
+    assert steps == [0, 1, -1, 3, 4, -1, 6, 7]
+    assert scheduler.timeouts == 2
+
+def test_failure():
+    evaluator = FakeEvaluator(failing=(1,))
+    with pytest.raises(ConnectionError):
+        NEATWrapper.AsyncScheduler(evaluator, concurrency=2).run(list(range(10)))
+    assert evaluator.started < 10
+    assert evaluator.inFlight == 0
+
+def test_socket(server):
+    pop = NEATWrapper.Population(6, 2, 2)
+    evaluator = NEATWrapper.SocketEvaluator('localhost', server, maxSteps=10)
+    steps = pop.evaluate(NEATWrapper.AsyncScheduler(evaluator, concurrency=2))
+    for gene, r in zip(pop.population, steps):
+        assert gene.steps == r
+        assert r == localEpisode(gene)
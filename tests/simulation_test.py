@@ -0,0 +1,192 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# * Third-party libraries
+import gc
+import pytest
+import random
+import sys
+import types
+
+sys.path.append('../')
+
+# * Custom Libraries
+import NEATWrapper
+from NEATWrapper import simulation
+
+class StubEnv:
+    """
+    Deterministic stand-in for a gym environment: a point that action 1 pushes right and action 0 pushes left, on top of a random drift drawn at reset. The episode ends once the point leaves [-1, 1], so genes get episodes of different lengths
+    """
+    _max_episode_steps = 40
+    observation_space = types.SimpleNamespace(shape=(3,))
+    action_space = types.SimpleNamespace(n=2)
+
+    # * Steps taken by all the stub environments of this process.
+    stepsTaken = 0
+
+    def __init__(self):
+        self.rng = random.Random()
+
+    def seed(self, seed):
+        self.rng = random.Random(seed)
+
+    def reset(self):
+        self.position = self.rng.uniform(-0.5, 0.5)
+        self.drift = self.rng.uniform(-0.1, 0.1)
+        self.t = 0
+        return self.observation()
+
+    def observation(self):
+        return [self.position, self.drift, self.t / 10]
+
+    def step(self, action):
+        StubEnv.stepsTaken += 1
+        self.t += 1
+        self.position += self.drift + (0.05 if action == 1 else -0.05)
+        return self.observation(), 1 + 0.5 * action, abs(self.position) > 1, {}
+
+@pytest.fixture
+def stub(monkeypatch):
+    monkeypatch.setattr(simulation, 'makeEnv', lambda name: StubEnv())
+
+def makeSimulation(**kwargs):
+    random.seed(4)
+    sim = NEATWrapper.Simulation('Stub-v0', 10, verbosity=0, seed=7, **kwargs)
+    for gene in sim.pop.population:
+        for _ in range(4):
+            gene.addConnection(sim.pop.innovationHistory)
+        gene.addNode(sim.pop.innovationHistory)
+        for connection in gene.connections:
+            connection.mutateWeights()
+        gene.phenotype = None
+
+    return sim
+
+def test_vectorized(stub, monkeypatch):
+    rows = []
+    getActions = NEATWrapper.PopulationPhenotype.getActions
+    def countRows(self, _inputs):
+        rows.append(len(_inputs))
+        return getActions(self, _inputs)
+    monkeypatch.setattr(NEATWrapper.PopulationPhenotype, 'getActions', countRows)
+
+    sim = makeSimulation(envs=3)
+    genes = sim.pop.population
+    StubEnv.stepsTaken = 0
+    serial = sim.evaluate(list(genes))
+    serialSteps = StubEnv.stepsTaken
+
+    StubEnv.stepsTaken = 0
+    vectorized = sim.evaluateVectorized(list(genes))
+    assert vectorized == serial
+    assert [gene.steps for gene in genes] == serial
+    # * Finished episodes are not stepped again, and free environments pick up the next gene.
+    assert StubEnv.stepsTaken == serialSteps
+    assert sum(rows) == serialSteps
+    assert max(rows) == 3
+    assert len(set(serial)) > 1
+
+def test_vectorized_more_envs(stub):
+    sim = makeSimulation(envs=16)
+    genes = sim.pop.population
+    assert sim.evaluateVectorized(list(genes)) == sim.evaluate(list(genes))
+
+def test_modes_agree(stub):
+    sim = makeSimulation(envs=4, workers=2)
+    genes = list(sim.pop.population)
+    try:
+        serial = sim.evaluate(genes)
+        assert sim.evaluateVectorized(genes) == serial
+        assert sim.evaluateParallel(genes) == serial
+        assert [gene.steps for gene in genes] == serial
+        assert sim.evaluateGenes(genes) == serial
+    finally:
+        sim.close()
+    assert sim.executor is None
+
+def test_close_population(stub):
+    sim = makeSimulation()
+    sim.pop.workers = 2
+    sim.evaluatePopulation()
+    sim.pop.naturalSelection()
+    assert sim.pop.executor is not None
+    sim.close()
+    assert sim.pop.executor is None
+
+def runRecords(**kwargs):
+    random.seed(4)
+    records = []
+    sim = NEATWrapper.Simulation('Stub-v0', 10, verbosity=0, envs=3, seed=7, sinks=[records.append], genomeMetrics=True, **kwargs)
+    sim.run(3, graph=False)
+    return sim, [{k: v for k, v in r.items() if k in ('type', 'generation', 'reward', 'nodes', 'connections')} for r in records]
+
+def test_packed(stub):
+    sim, packed = runRecords(packed=True)
+    assert all(isinstance(gene, NEATWrapper.PackedGenome) for gene in sim.pop.population)
+    assert runRecords()[1] == packed
+    assert [r['generation'] for r in packed if r['type'] == 'generation'] == [1, 2, 3]
+
+def test_race_species(stub, monkeypatch):
+    calls = []
+    def record(evaluate, count, episodes, **kwargs):
+        calls.append(kwargs)
+        return race(evaluate, count, episodes, **kwargs)
+    race = simulation.race
+    monkeypatch.setattr(simulation, 'race', record)
+
+    random.seed(4)
+    sim = NEATWrapper.Simulation('Stub-v0', 10, verbosity=0, episodes=4, quantile=0.25, z=3)
+    sim.evaluatePopulation()
+    sim.pop.naturalSelection()
+    sim.evaluatePopulation()
+    assert [(c['quantile'], c['z']) for c in calls] == [(0.25, 3), (0.25, 3)]
+    # * The first generation has no species yet, the second is raced per species of the first.
+    assert calls[0]['groups'] == [-1] * 10
+    assert calls[1]['groups'] == NEATWrapper.assignSpecies(sim.pop.population, sim.pop.species)
+    assert all(g >= 0 for g in calls[1]['groups'])
+
+def test_cache(stub, monkeypatch):
+    evaluated = []
+    runEpisode = simulation.runEpisode
+    def record(env, gene, *args, **kwargs):
+        evaluated.append(gene)
+        return runEpisode(env, gene, *args, **kwargs)
+    monkeypatch.setattr(simulation, 'runEpisode', record)
+
+    def generations(cache):
+        sim = makeSimulation(cache=cache)
+        rewards, hashes, stepped = [], [], []
+        for _ in range(2):
+            del evaluated[:]
+            rewards.append(sim.evaluatePopulation())
+            hashes.append([gene.getPhenotype().hash() for gene in sim.pop.population])
+            stepped.append(list(evaluated))
+            sim.pop.naturalSelection()
+        return sim, rewards, hashes, stepped
+
+    _, rewards, hashes, _ = generations(None)
+    cache = NEATWrapper.FitnessCache()
+    sim, cachedRewards, cachedHashes, stepped = generations(cache)
+    assert cachedRewards == rewards
+    assert cachedHashes == hashes
+
+    # * The second generation starts with the cloned champions, which the cache already knows.
+    seen = set(hashes[0])
+    repeats = [h in seen for h in hashes[1]]
+    assert repeats[0]
+    assert cache.hits == sum(repeats)
+    assert cache.misses == len(hashes[0]) + len(hashes[1]) - sum(repeats)
+    assert len(stepped[1]) == len(hashes[1]) - sum(repeats)
+    assert all(gene.getPhenotype().hash() not in seen for gene in stepped[1])
+
+def test_dropped_executor(stub):
+    sim = makeSimulation(workers=2)
+    sim.evaluateParallel()
+    executor = sim.executor
+    del sim
+    gc.collect()
+    assert executor._shutdown_thread
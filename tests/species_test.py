@@ -0,0 +1,115 @@
+# ================================
+# Author: Kristian N Jensen
+# Date: 18/10 - 26
+# Project: NEAT
+# ================================
+
+# * Third-party libraries
+import pytest
+import random
+import sys
+import numpy as np
+
+sys.path.append('../')
+
+# * Custom Libraries
+import NEATWrapper
+
+@pytest.fixture
+def innovation():
+    return NEATWrapper.Innovation()
+
+@pytest.fixture
+def genes(innovation):
+    random.seed(2)
+    genes = [NEATWrapper.Genome(3, 2, innovation) for _ in range(6)]
+    for gene in genes:
+        for _ in range(random.randint(0, 4)):
+            gene.addConnection(innovation)
+        for _ in range(random.randint(0, 2)):
+            gene.addNode(innovation)
+    return genes
+
+def naiveDiff(gene1, gene2):
+    match = 0
+    totalDiff = 0
+    for c1 in gene1.connections:
+        for c2 in gene2.connections:
+            if c1.innovation == c2.innovation:
+                match += 1
+                totalDiff += abs(c1.weight - c2.weight)
+                break
+    topoDiff = len(gene1.connections) + len(gene2.connections) - 2*match
+    return topoDiff, (totalDiff/match if match else 100)
+
+def test_getGeneArrays(genes):
+    innovations, weights = genes[0].getGeneArrays()
+    assert list(innovations) == sorted(c.innovation for c in genes[0].connections)
+    assert len(weights) == len(genes[0].connections)
+
+def test_compareGenes(genes):
+    for gene1 in genes:
+        for gene2 in genes:
+            excess, disjoint, weightDiff = NEATWrapper.compareGenes(gene1.getGeneArrays(), gene2.getGeneArrays())
+            topoDiff, expected = naiveDiff(gene1, gene2)
+            assert excess + disjoint == topoDiff
+            assert weightDiff == pytest.approx(expected)
+
+def test_compareGenes_excess(innovation):
+    node1 = NEATWrapper.Node(1, 'input', layer=0)
+    node2 = NEATWrapper.Node(2, 'output', layer=1)
+    node3 = NEATWrapper.Node(3, 'output', layer=1)
+    conn1 = innovation.checkConnection(node1, node2, weight=1)
+    conn2 = innovation.checkConnection(node1, node3, weight=1)
+    genes1 = (np.array([conn1.innovation]), np.array([1.0]))
+    genes2 = (np.array([conn1.innovation, conn2.innovation]), np.array([0.5, 1.0]))
+    assert NEATWrapper.compareGenes(genes1, genes2) == (1, 0, 0.5)
+
+def test_compare(genes):
+    species = NEATWrapper.Species(genes[0])
+    assert species.compare(genes[0])
+    for gene in genes:
+        topoDiff, weightDiff = naiveDiff(species.represent, gene)
+        assert species.getTopologicalDiff(gene) == topoDiff
+        assert species.getWeightDiff(gene) == pytest.approx(weightDiff)
+        assert species.compare(gene) == (3 > topoDiff + 0.5*weightDiff)
+
+def greedySpeciate(genes, species):
+    for s in species:
+        s.clear()
+    for gene in genes:
+        for s in species:
+            if s.compare(gene):
+                s.addToSpecies(gene)
+                break
+        else:
+            species.append(NEATWrapper.Species(gene))
+
+def test_speciate(innovation):
+    random.seed(3)
+    genes = [NEATWrapper.Genome(3, 2, innovation) for _ in range(60)]
+    for gene in genes:
+        gene.mutate(innovation)
+        for _ in range(random.randint(0, 3)):
+            gene.addConnection(innovation)
+        if random.random() < 0.3:
+            gene.addNode(innovation)
+
+    species, expected = [], []
+    NEATWrapper.speciate(genes[:20], species)
+    greedySpeciate(genes[:20], expected)
+
+    NEATWrapper.speciate(genes, species)
+    greedySpeciate(genes, expected)
+    assert len(species) == len(expected) > 1
+    for s, e in zip(species, expected):
+        assert [id(g) for g in s.members] == [id(g) for g in e.members]
+
+def test_compatibilityMatrix(genes):
+    species = [NEATWrapper.Species(genes[0]), NEATWrapper.Species(genes[3])]
+    matrix = NEATWrapper.compatibilityMatrix(genes, species)
+    assert matrix.shape == (len(genes), 2)
+    for i, gene in enumerate(genes):
+        for j, s in enumerate(species):
+            expected = s.getTopologicalDiff(gene)*s.topoCoeff + s.getWeightDiff(gene)*s.weightCoeff
+            assert matrix[i, j] == pytest.approx(expected)